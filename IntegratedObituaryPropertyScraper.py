@@ -1,307 +1,328 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
 import undetected_chromedriver as uc
-import pandas as pd
 import time
 from datetime import datetime
-import re
 import os
 import sys
-import csv
-from google.oauth2.credentials import Credentials
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
 from dotenv import load_dotenv
-import io
+import json
+import threading
+from collections import Counter, deque
+from auditor_client import AuditorHTTPClient, LookupFailed, PROPERTY_COLUMNS, NOT_FOUND, NO_RECORDS_TEXT, SEARCH_PATH, parse_datalet, parse_search_candidates
+from candidate_ranking import Person, best_candidate
+from lookup_pool import PropertyLookupPool, SeleniumLookupSession
+from driver_pool import DriverPool, LAUNCH_LOCK
+from request_blocking import RequestBlocker
+from property_cache import PropertyCache
+from parcel_index import open_parcel_index
+from entity_resolution import cluster_lookup, resolve_entities
+from scrape_state import SourceHighWaterMark
+from obituary_store import ObituaryStore
+from record_sink import CSVRecordSink, drop_duplicate_rows
+from checkpoint import RunCheckpoint
+from drive_upload import DriveUploader
+from parquet_export import export_parquet
+from name_parsing import split_names, split_name as parse_name
+from browser_scripts import LEGACY_EXTRACT_SCRIPT, DISPATCH_EXTRACT_SCRIPT, LEGACY_CARD_SELECTOR, DISPATCH_CARD_SELECTOR
+from readiness import (ReadinessWaiter, document_ready, network_idle, dom_quiescent, element_present,
+                       element_absent, element_count, element_count_changed, script_value_changed,
+                       text_present, any_of, all_of, retry_backoff)
+from sources import scrape_all_sources
+from listing_parsers import parse_legacy_cards, parse_dispatch_cards
+from counties import County, get_county
+from run_metrics import RunMetrics
 import traceback
 class IntegratedObituaryPropertyScraper:
-    def __init__(self):
-        self.obituaries = []
-        self.sources = {
-            'legacy': "https://www.legacy.com/us/obituaries/local/ohio/franklin-county",
-            'dispatch': "https://www.dispatch.com/obituaries/"
-        }
+    def __init__(self, lookup_engine=None, lookup_workers=None, lookup_rate=None, use_cache=True, full_rescan=None, fetch_mode=None, resume=None, output_format=None, county=None, use_parcel_index=True):
+        self.obituaries = ObituaryStore()
         self.driver = None
-        self.folder_id = "1Vn02sVpKU9fGLGG3fo-ZgngWXKhntNvb"
+        self.drive_uploader = None
         load_dotenv()  # Load environment variables
+        # Listing URLs, auditor site and Drive folder come from counties.json ($COUNTY, default Franklin)
+        self.county = county if isinstance(county, County) else get_county(county)
+        self.sources = dict(self.county.sources)
+        self.folder_id = self.county.folder_id
+        self.auditor_base_url = (os.getenv('AUDITOR_BASE_URL') or self.county.auditor_url).rstrip('/')
+        self.state_dir = self.county.state_dir
+        # 'selenium' drives Chrome through the search form, 'http' posts it directly
+        self.lookup_engine = (lookup_engine or os.getenv('AUDITOR_ENGINE', 'selenium')).lower()
+        self.auditor_client = None
+        # Independent lookup sessions and the global politeness limit they share (lookups/second)
+        self.lookup_workers = int(lookup_workers or os.getenv('LOOKUP_WORKERS', 1))
+        # 0 means unlimited, so only a missing rate falls back to $LOOKUP_RATE
+        self.lookup_rate = float(lookup_rate if lookup_rate is not None else os.getenv('LOOKUP_RATE', 0.5))
+        self._scrape_driver_taken = False
+        self.lookup_session_lock = threading.Lock()
+        self.driver_pool = None
+        # Drop images, fonts, media and ad/tracker requests before Chrome fetches them
+        self.request_blocker = RequestBlocker(enabled=os.getenv('REQUEST_BLOCKING', '1') != '0')
+        self.property_cache = PropertyCache(state_dir=self.state_dir) if use_cache else None
+        # Owner index from the county's bulk parcel extract; names it resolves never reach the auditor site
+        self.parcel_index = open_parcel_index(self.state_dir) if use_parcel_index else None
+        # Cluster rows naming the same person across sources so each person is looked up once
+        self.entity_resolution = os.getenv('ENTITY_RESOLUTION', '1') != '0'
+        # Ignore the per-source high-water marks and scroll every listing to the end
+        self.full_rescan = full_rescan if full_rescan is not None else os.getenv('FULL_RESCAN', '') == '1'
+        # Marks advanced by this run's scrape, saved only once the output has been uploaded
+        self.high_water_marks = []
+        # 'script' pulls only newly rendered legacy.com cards out of the page, 'page_source' re-parses the whole page
+        self.legacy_extraction = os.getenv('LEGACY_EXTRACTION', 'script')
+        # 'browser' scrolls the listings in Chrome, 'http' decodes their embedded page state,
+        # 'auto' tries http first and falls back to the browser per source
+        self.fetch_mode = (fetch_mode or os.getenv('FETCH_MODE', 'browser')).lower()
+        # Condition-based waits replace fixed sleeps; each wait is timed per call site
+        self.waits = ReadinessWaiter()
+        # Journal of the scraped set and finished lookups; --resume picks up where a failed run stopped
+        self.resume = resume if resume is not None else os.getenv('RESUME', '') == '1'
+        self.checkpoint = RunCheckpoint(state_dir=self.state_dir)
+        # 'csv', 'parquet' (typed columnar copy for analytics) or 'both' is uploaded to Drive
+        self.output_format = (output_format or os.getenv('OUTPUT_FORMAT', 'csv')).lower()
+        # Stage timings, lookup latencies and counters; each run leaves a JSON report and a Prometheus textfile
+        self.metrics = RunMetrics({'county': self.county.key, 'engine': self.lookup_engine})
+        self.metrics_dir = os.getenv('METRICS_DIR') or os.path.join(self.state_dir, 'metrics')
+        self.metrics_paths = None
 
-    def setup_google_drive(self):
-        """Setup Google Drive API service"""
-        try:
-            credentials = service_account.Credentials.from_service_account_info(
-                eval(os.getenv('GOOGLE_CREDENTIALS_JSON')),
-                scopes=['https://www.googleapis.com/auth/drive.file']
-            )
-            return build('drive', 'v3', credentials=credentials)
-        except Exception as e:
-            print(f"Error setting up Google Drive: {e}")
-            return None
-
-    def save_to_drive(self, df, filename):
-        """Save DataFrame to Google Drive"""
-        try:
-            # Create drive service
-            drive_service = self.setup_google_drive()
-            if not drive_service:
-                print("Failed to setup Google Drive service")
-                return False
-
-            # Save DataFrame to temporary file
-            temp_filename = f"temp_{filename}"
-            df.to_csv(temp_filename, index=False)
-
-            # Prepare file metadata
-            file_metadata = {
-                'name': filename,
-                'parents': [self.folder_id]
-            }
-
-            # Create media
-            media = MediaFileUpload(
-                temp_filename,
-                mimetype='text/csv',
-                resumable=True
-            )
+    def get_drive_uploader(self):
+        """Shared Drive uploader; its authenticated client is built once per run"""
+        if self.drive_uploader is None:
+            self.drive_uploader = DriveUploader(self.folder_id)
+        return self.drive_uploader
 
-            # Upload file
-            file = drive_service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id'
-            ).execute()
-
-            # Remove temporary file
-            os.remove(temp_filename)
-
-            print(f"\nSuccessfully uploaded {filename} to Google Drive")
-            print(f"File ID: {file.get('id')}")
-            return True
+    def save_high_water_marks(self):
+        """Persist the sources' high-water marks, so the next run stops at what this one delivered"""
+        for mark in self.high_water_marks:
+            try:
+                mark.save()
+            except Exception as e:
+                print(f"Error saving high-water mark {mark.path}: {e}")
+        self.high_water_marks = []
 
+    def upload_files_to_drive(self, paths):
+        """Upload finished output files to Google Drive in parallel; True if every upload succeeded"""
+        try:
+            with self.metrics.span('drive.upload'):
+                file_ids = self.get_drive_uploader().upload_many((path, os.path.basename(path)) for path in paths)
         except Exception as e:
             print(f"Error saving to Google Drive: {e}")
+            self.metrics.count('drive.upload_failures', len(paths))
             return False
+        self.metrics.count('drive.upload_failures', sum(not file_id for file_id in file_ids))
+        for path, file_id in zip(paths, file_ids):
+            if file_id:
+                print(f"\nSuccessfully uploaded {os.path.basename(path)} to Google Drive")
+                print(f"File ID: {file_id}")
+        return all(file_ids)
     #
     def setup_driver(self):
         """Initialize undetected-chromedriver with enhanced stability for GitHub Actions"""
         try:
-            time.sleep(2)
-            
-            options = uc.ChromeOptions()
-            
-            # Stability options
-            options.add_argument('--no-sandbox')
-            options.add_argument('--headless=new')  # New headless mode
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument('--start-maximized')
-            options.add_argument('--disable-notifications')
-            options.add_argument('--disable-extensions')
-            
-            # Additional stability options
-            options.add_argument('--disable-features=VizDisplayCompositor')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--disable-web-security')
-            options.add_argument('--no-first-run')
-            options.add_argument('--no-default-browser-check')
-            options.add_argument('--ignore-certificate-errors')
-            options.add_argument('--remote-debugging-port=9222')
-            
-            # Set user agent
-            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            
-            # Create driver with retry logic
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    print(f"Attempt {attempt + 1} to create driver...")
-                    self.driver = uc.Chrome(
+            self.driver = self.create_driver()
+        except Exception as e:
+            print(f"Error setting up Chrome driver: {e}")
+            print(f"Full error: {traceback.format_exc()}")
+            sys.exit(1)
+
+    def create_driver(self):
+        """Launch a new Chrome session; lookup workers each get their own"""
+        options = uc.ChromeOptions()
+        
+        # Stability options
+        options.add_argument('--no-sandbox')
+        options.add_argument('--headless=new')  # New headless mode
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument('--start-maximized')
+        options.add_argument('--disable-notifications')
+        options.add_argument('--disable-extensions')
+        # Performance log feeds the request-blocking counters; unread, ChromeDriver would buffer it all run
+        if self.request_blocker.enabled:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        
+        # Additional stability options
+        options.add_argument('--disable-features=VizDisplayCompositor')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--disable-web-security')
+        options.add_argument('--no-first-run')
+        options.add_argument('--no-default-browser-check')
+        options.add_argument('--ignore-certificate-errors')
+        # No fixed --remote-debugging-port: concurrent sessions would collide on it
+        
+        # Set user agent
+        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        
+        # Create driver with retry logic
+        max_retries = 3
+        driver = None
+        started = time.monotonic()
+        for attempt in range(max_retries):
+            try:
+                print(f"Attempt {attempt + 1} to create driver...")
+                with LAUNCH_LOCK:
+                    driver = uc.Chrome(
                         options=options,
                         driver_executable_path=None,
                         version_main=None,
                         use_subprocess=True
                     )
-                    
-                    # Configure driver settings
-                    self.driver.set_page_load_timeout(30)
-                    self.driver.implicitly_wait(10)
-                    
-                    # Test the driver
-                    self.driver.get('about:blank')
-                    print(f"✓ Chrome driver setup complete (attempt {attempt + 1})")
-                    return
-                    
-                except Exception as e:
-                    print(f"Driver setup attempt {attempt + 1} failed: {e}")
-                    if attempt < max_retries - 1:
-                        print("Retrying driver setup...")
-                        time.sleep(5)
-                        if self.driver:
-                            try:
-                                self.driver.quit()
-                            except:
-                                pass
-                    else:
-                        raise
-            
-        except Exception as e:
-            print(f"Error setting up Chrome driver: {e}")
-            print(f"Full error: {traceback.format_exc()}")
-            sys.exit(1)
+                
+                # Configure driver settings
+                driver.set_page_load_timeout(30)
+                driver.implicitly_wait(10)
+                
+                # Test the driver
+                driver.get('about:blank')
+                print(f"✓ Chrome driver setup complete (attempt {attempt + 1})")
+                self.metrics.add_span('driver.launch', time.monotonic() - started)
+                return driver
+                
+            except Exception as e:
+                print(f"Driver setup attempt {attempt + 1} failed: {e}")
+                self.metrics.count('driver.launch_failures')
+                if attempt < max_retries - 1:
+                    print("Retrying driver setup...")
+                    time.sleep(retry_backoff(attempt + 1))
+                    if driver:
+                        try:
+                            driver.quit()
+                        except:
+                            pass
+                        driver = None
+                else:
+                    self.metrics.add_span('driver.launch', time.monotonic() - started, failed=True)
+                    raise
 
     def split_name(self, full_name):
         """Split full name into first and last name with special case handling"""
-        # Clean and split the name
-        name_without_dates = re.sub(r'\s*\d{4}-\d{4}\s*$', '', full_name.strip())
-        name_without_dates = re.sub(r'\s*(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\s*$', '', name_without_dates)
-        name_without_nickname = re.sub(r'\s*[\(\[].+?[\)\]]\s*', '', name_without_dates)
-        parts = [part for part in name_without_nickname.strip().split() if part]
-        
-        if len(parts) >= 2:
-            if parts[0].lower().replace('.', '') == 'dr':
-                first_name = parts[1] if len(parts) > 2 else parts[0]
-                start_index = 1
-            else:
-                first_name = parts[0]
-                start_index = 0
-
-            last_word = parts[-1].lower().replace('.', '')
-            if (last_word in ['jr', 'sr', 'ii', 'iii', 'iv', 'v','tr'] or 
-                (len(last_word) == 1 and last_word.isalpha())):
-                last_name = parts[-2] if len(parts) > 1 else parts[-1]
-            else:
-                last_name = parts[-1]
-            
-            full_name = ' '.join(parts)
-            return first_name, last_name, full_name
-        
-        return full_name, '', full_name
+        return parse_name(full_name)
 
     # [Previous scraping methods remain the same: scrape_legacy, scrape_fcfreepress, scrape_dispatch]
+    def scroll_settled(self, card_selector, card_count, page_height):
+        """Condition for a scroll step: new cards or a taller page, or the page going quiet"""
+        return any_of(
+            element_count_changed(card_selector, card_count),
+            script_value_changed("return document.body.scrollHeight", page_height),
+            all_of(network_idle(0.3), dom_quiescent(0.3)),
+        )
+
     # Include all the scraping methods from the first code here
     def scrape_legacy(self, driver):
         """Scrape obituaries from legacy.com"""
         print("\nScraping legacy.com...")
+        self.request_blocker.apply(driver, 'legacy')
         driver.get(self.sources['legacy'])
-        time.sleep(5)
-        try:
-            no_thanks_button = driver.find_element(By.CSS_SELECTOR, "button[data-click='close']")
-            no_thanks_button.click()
-            print("Closed popup successfully")
-            time.sleep(2)  # Wait for popup to close
-        except Exception as e:
-            print("No popup found or couldn't close it:", e)
+        self.waits.wait(driver, all_of(document_ready(), element_present(LEGACY_CARD_SELECTOR)), 10, 'legacy.load')
+        popup_selector = "button[data-click='close']"
+        if self.waits.wait(driver, element_present(popup_selector), 3, 'legacy.popup'):
+            try:
+                driver.find_element(By.CSS_SELECTOR, popup_selector).click()
+                self.waits.wait(driver, element_absent(popup_selector), 2, 'legacy.popup_close')
+                print("Closed popup successfully")
+            except Exception as e:
+                print("Couldn't close popup:", e)
+        else:
+            print("No popup found")
+
+        mark = SourceHighWaterMark('legacy.com', full_rescan=self.full_rescan, state_dir=self.state_dir)
+
+        def visible_card_pairs():
+            """Return (date header, full name) pairs for rendered cards"""
+            if self.legacy_extraction == 'script':
+                try:
+                    # Only cards rendered since the previous call come back
+                    return json.loads(driver.execute_script(LEGACY_EXTRACT_SCRIPT))
+                except Exception as e:
+                    print(f"In-browser extraction failed, falling back to page source: {e}")
+                    self.legacy_extraction = 'page_source'
+
+            return parse_legacy_cards(driver.page_source)
 
         def collect_visible_obituaries():
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            current_date = None
-            current_entries = set()
-            
-            for element in soup.find_all(['p', 'h4']):
-                if element.get('color') == 'neutral50' and 'Box-sc-ucqo0b-0' in element.get('class', []):
-                    current_date = element.text.strip()
-                elif element.get('data-component') == 'PersonCardFullName':
-                    full_name = element.text.strip()
-                    if current_date and full_name:
-                        first_name, last_name, name = self.split_name(full_name)
-                        entry = {
-                                'first_name': first_name,
-                                'last_name': last_name,
-                                'name': name,
-                                'date': current_date,
-                                'source': 'legacy.com',
-                                'age': 'N/A',
-                                'location': 'Ohio',
-                                'Tag': 'Obituary-Ahmed fetched'  # Add this line
-                            }
-                        self.obituaries.append(entry)
+            """Collect rendered cards and return the ones not seen earlier in this run"""
+            new_entries = []
+            pairs = visible_card_pairs()
+            parsed = split_names(full_name for _, full_name in pairs).itertuples(index=False, name=None)
+            for (current_date, _), (first_name, last_name, name) in zip(pairs, parsed):
+                record = self.obituaries.add(
+                    first_name, last_name, name, current_date, 'legacy.com',
+                    age='N/A', location='Ohio',
+                    tag='Obituary-Ahmed fetched'
+                )
+                if record:
+                    new_entries.append(record)
+            return new_entries
             
         current_position = 0
         scroll_amount = 500
         
         while True:
-            collect_visible_obituaries()
+            new_entries = collect_visible_obituaries()
+            mark.record(new_entries)
+            if mark.all_known(new_entries):
+                print("Reached obituaries collected on a previous run")
+                break
             current_position += scroll_amount
+            card_count = element_count(driver, LEGACY_CARD_SELECTOR)
+            page_height = driver.execute_script("return document.body.scrollHeight")
             driver.execute_script(f"window.scrollTo(0, {current_position});")
-            time.sleep(1)
+            self.waits.wait(driver, self.scroll_settled(LEGACY_CARD_SELECTOR, card_count, page_height), 3, 'legacy.scroll')
             
             total_height = driver.execute_script("return document.body.scrollHeight")
             if current_position >= total_height:
-                collect_visible_obituaries()
+                mark.record(collect_visible_obituaries())
                 break
+        self.request_blocker.collect(driver, 'legacy')
+        self.high_water_marks.append(mark)
             
     def scrape_dispatch(self, driver):
         """Scrape obituaries from dispatch.com"""
         print("\nScraping dispatch.com...")
+        self.request_blocker.apply(driver, 'dispatch')
         driver.get(self.sources['dispatch'])
-        time.sleep(2)
+        self.waits.wait(driver, all_of(document_ready(), element_present(DISPATCH_CARD_SELECTOR)), 10, 'dispatch.load')
 
         scroll_count = 0
         max_scrolls = 50
+        mark = SourceHighWaterMark('dispatch.com', full_rescan=self.full_rescan, state_dir=self.state_dir)
 
         while scroll_count < max_scrolls:
+            new_entries = []
             try:
-                date_headers = driver.find_elements(By.CSS_SELECTOR, 'h2.MuiTypography-root.MuiTypography-h2.css-1cbvm0s')
+                # One round trip returns every rendered card with its date header
+                try:
+                    cards = json.loads(driver.execute_script(DISPATCH_EXTRACT_SCRIPT))
+                except Exception as e:
+                    print(f"In-browser extraction failed, parsing page source: {e}")
+                    cards = parse_dispatch_cards(driver.page_source)
                 
-                for date_header in date_headers:
-                    current_date = date_header.text
-                    
-                    containers = driver.find_elements(By.CSS_SELECTOR, 'div.MuiGrid-root.MuiGrid-container.css-1rwztak')
-                    
-                    for container in containers:
-                        try:
-                            name_element = container.find_element(By.CSS_SELECTOR, 'h2.obit-title')
-                            name = name_element.text.strip()
-                            
-                            try:
-                                age = container.find_element(By.CSS_SELECTOR, '[aria-label="age"]').text.replace('Age ', '').strip()
-                            except:
-                                age = 'N/A'
-                                
-                            try:
-                                location = container.find_element(By.CSS_SELECTOR, '[aria-label="location"]').text.strip()
-                            except:
-                                location = 'N/A'
-                            
-                            first_name, last_name, full_name = self.split_name(name)
-                            entry = {
-                                'first_name': first_name,
-                                'last_name': last_name,
-                                'date': current_date,
-                                'name': full_name,
-                                'source': 'dispatch.com',
-                                'age': age,
-                                'location': location,
-                                'Tag': 'Obituary-Ahmed fetched'  # Add this line
-                            }
-                            # Check for duplicates before adding
-                            if not any(
-                                o['first_name'] == entry['first_name'] and 
-                                o['last_name'] == entry['last_name'] and 
-                                o['date'] == entry['date'] and 
-                                o['source'] == entry['source'] 
-                                for o in self.obituaries
-                            ):
-                                self.obituaries.append(entry)
-                                print(f"Successfully scraped: {name}")
-                                
-                        except Exception as e:
-                            print(f"Error processing container: {e}")
-                            continue
+                parsed = split_names(card[1] for card in cards).itertuples(index=False, name=None)
+                for (current_date, name, age, location), (first_name, last_name, full_name) in zip(cards, parsed):
+                    record = self.obituaries.add(
+                        first_name, last_name, full_name, current_date, 'dispatch.com',
+                        age=age or 'N/A', location=location or 'N/A',
+                        tag='Obituary-Ahmed fetched'
+                    )
+                    if record:
+                        new_entries.append(record)
+                        print(f"Successfully scraped: {name}")
                             
             except Exception as e:
                 print(f"Error extracting data: {e}")
 
+            mark.record(new_entries)
+            if mark.all_known(new_entries):
+                print("Reached obituaries collected on a previous run")
+                break
+
             last_height = driver.execute_script("return document.body.scrollHeight")
             current_scroll = driver.execute_script("return window.pageYOffset")
             
+            card_count = element_count(driver, DISPATCH_CARD_SELECTOR)
             driver.execute_script("window.scrollBy(0, 500);")
-            time.sleep(1)
+            self.waits.wait(driver, self.scroll_settled(DISPATCH_CARD_SELECTOR, card_count, last_height), 3, 'dispatch.scroll')
             
             new_scroll = driver.execute_script("return window.pageYOffset")
             if new_scroll == current_scroll:
@@ -309,15 +330,68 @@ class IntegratedObituaryPropertyScraper:
                 break
                 
             scroll_count += 1
+        self.request_blocker.collect(driver, 'dispatch')
+        self.high_water_marks.append(mark)
 
-    def search_property(self, first_name, last_name):
-        """Search property information for a given name"""
+    def get_driver(self):
+        """Return the shared Chrome driver, launching it on first use"""
+        if self.driver is None:
+            self.setup_driver()
+        return self.driver
+
+    def borrow_driver(self):
+        """Hand the shared driver to the first source and a fresh one to each concurrent source after it"""
+        with self.lookup_session_lock:
+            if not self._scrape_driver_taken:
+                self._scrape_driver_taken = True
+                return self.get_driver(), False
+        return self.create_driver(), True
+
+    def scrape_listing_http(self, adapter):
+        """Fetch a listing over plain HTTP and decode obituaries from its embedded page state"""
+        print(f"\nFetching {adapter.key} listing over HTTP...")
         try:
+            cards = adapter.extract(adapter.fetch())
+        except Exception as e:
+            print(f"Error fetching {adapter.key} listing: {e}")
+            return 0
+
+        mark = SourceHighWaterMark(adapter.source_name, full_rescan=self.full_rescan, state_dir=self.state_dir)
+        new_entries = []
+        parsed = split_names(card[1] for card in cards).itertuples(index=False, name=None)
+        for (current_date, name, age, location), (first_name, last_name, full_name) in zip(cards, parsed):
+            record = self.obituaries.add(
+                first_name, last_name, full_name, current_date, adapter.source_name,
+                age=age or adapter.default_age, location=location or adapter.default_location,
+                tag='Obituary-Ahmed fetched'
+            )
+            if record:
+                new_entries.append(record)
+        mark.record(new_entries)
+        self.high_water_marks.append(mark)
+        print(f"Decoded {len(cards)} obituaries from {adapter.key} page state")
+        return len(cards)
+
+    def search_property(self, first_name, last_name, driver=None, hints=None):
+        """Search property information for a given name
+
+        `hints` (full_name, location) pick the likeliest owner when the search lists several.
+        Always asks the auditor; the parcel index is consulted once, before the lookup is queued.
+        Raises LookupFailed when the auditor could not be searched.
+        """
+        if self.lookup_engine == 'http':
+            if self.auditor_client is None:
+                self.auditor_client = AuditorHTTPClient(base_url=self.auditor_base_url)
+            return self.auditor_client.search_property(first_name, last_name, hints=hints)
+
+        driver = driver or self.driver
+        try:
+            self.request_blocker.apply(driver, 'auditor')
             # Navigate to the search page
-            self.driver.get('https://property.franklincountyauditor.com/_web/search/commonsearch.aspx?mode=owner')
+            driver.get(self.auditor_base_url + SEARCH_PATH)
             
             # Wait for the search input
-            search_box = WebDriverWait(self.driver, 10).until(
+            search_box = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.ID, "inpOwner"))
             )
             
@@ -327,124 +401,274 @@ class IntegratedObituaryPropertyScraper:
             search_box.send_keys(search_query)
             search_box.send_keys(Keys.RETURN)
             
-            time.sleep(2)
+            # A results list, a single match's datalet or the no-records notice
+            if not self.waits.wait(driver, any_of(
+                element_present('tr.SearchResults'),
+                element_present('.DataletSideHeading'),
+                text_present(NO_RECORDS_TEXT),
+            ), 10, 'auditor.search'):
+                raise LookupFailed("auditor search did not answer in time")
             
             # Check for "no records found"
-            try:
-                no_records = self.driver.find_element(By.XPATH, "//large[contains(text(), 'Your search did not find any records')]")
-                if no_records:
-                    return 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR'
-            except:
-                pass
+            if text_present(NO_RECORDS_TEXT)(driver):
+                return NOT_FOUND
             
             # Handle results page
-            if "CommonSearch.aspx?mode=OWNER" in self.driver.current_url:
-                try:
-                    first_result = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "tr.SearchResults"))
-                    )
-                    first_result.click()
-                except:
-                    return 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR'
-            
-            time.sleep(2)
-            
-            # Extract information
-            owner_mailing = 'NOTONAUDITOR'
-            contact_address = 'NOTONAUDITOR'
-            site_address = 'NOTONAUDITOR'
-            city = 'NOTONAUDITOR'
-            zip_code = 'NOTONAUDITOR'
-            
-            rows = self.driver.find_elements(By.CSS_SELECTOR, "tr")
-            for row in rows:
-                try:
-                    heading = row.find_element(By.CLASS_NAME, "DataletSideHeading").text
-                    data = row.find_element(By.CLASS_NAME, "DataletData").text
-                    
-                    if "Owner Mailing" in heading and "Contact Address" not in heading:
-                        owner_mailing = data
-                    elif "Contact Address" in heading:
-                        contact_address = data
-                    elif "Site (Property) Address" in heading:
-                        site_address = data
-                    elif "City/Village" in heading:
-                        city = data
-                    elif "Zip Code" in heading:
-                        zip_code = data
-                except:
-                    continue
-            
-            return owner_mailing, contact_address, site_address, city, zip_code
-            
+            if "CommonSearch.aspx?mode=OWNER" in driver.current_url:
+                # Score every row from one read of the page and open only the best match
+                candidates = parse_search_candidates(driver.page_source, driver.current_url)
+                best = best_candidate(candidates, Person(first_name, last_name, **(hints or {})))
+                if best is None:
+                    self.metrics.count('lookup.rejected')
+                    return NOT_FOUND
+                driver.find_elements(By.CSS_SELECTOR, "tr.SearchResults")[best['index']].click()
+            
+            if not self.waits.wait(driver, element_present('.DataletSideHeading'), 10, 'auditor.datalet'):
+                # An empty parse here would be cached as a miss
+                raise LookupFailed("auditor datalet did not load in time")
+            
+            # Parse the datalet in one pass; a find_element per row paid the
+            # implicit wait on every row without a heading
+            return parse_datalet(driver.page_source)
+            
+        except LookupFailed:
+            raise
         except Exception as e:
-            print(f"Error searching property for {first_name} {last_name}: {str(e)}")
-            return 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR', 'NOTONAUDITOR'
+            # Not the same as not being on the auditor: the caller must not cache this
+            raise LookupFailed(str(e)) from e
+
+    def create_lookup_session(self):
+        """Create one independent lookup session for a worker in the lookup pool"""
+        if self.lookup_engine == 'http':
+            return AuditorHTTPClient(base_url=self.auditor_base_url)
+        return SeleniumLookupSession(self, self.get_driver_pool())
+
+    def get_driver_pool(self):
+        """Return the lookup driver pool, pre-launching its sessions in the background on first use"""
+        with self.lookup_session_lock:
+            if self.driver_pool is None:
+                self.driver_pool = DriverPool(self.create_driver, size=self.lookup_workers)
+                self.driver_pool.start()
+        return self.driver_pool
+
+    def iter_lookup_properties(self, names):
+        """Yield property 5-tuples for (first_name, last_name[, hints]) in input order, consulting the cache before any lookup"""
+        def cached(first_name, last_name, hints=None):
+            result = self.checkpoint.get(first_name, last_name, hints)
+            if result is None and self.parcel_index:
+                # Resolved locally, without taking a slot from the lookup rate limit
+                result = self.parcel_index.lookup(first_name, last_name, hints)
+                if result:
+                    self.metrics.count('lookup.parcel_index')
+            if result is None and self.property_cache:
+                result = self.property_cache.get(first_name, last_name, hints)
+            if result:
+                self.metrics.count('lookup.cached')
+                self.report_lookup(first_name, last_name, result)
+            return result
+
+        def on_result(first_name, last_name, result, hints=None):
+            # Keyed on the hints too: they decide which of several owners was chosen
+            self.checkpoint.record(first_name, last_name, result, hints)
+            if self.property_cache:
+                self.property_cache.put(first_name, last_name, result, hints)
+            self.report_lookup(first_name, last_name, result)
+
+        pool = PropertyLookupPool(
+            self.create_lookup_session,
+            workers=self.lookup_workers,
+            rate_per_second=self.lookup_rate,
+            metrics=self.metrics
+        )
+        return pool.imap(names, on_result=on_result, cached=cached, on_error=self.checkpoint.record_failure)
+
+    def enrich_clusters(self, clusters):
+        """Yield the rows of each cluster of one person, all filled in from the cluster's single lookup"""
+        # Only clusters whose lookup is still in flight are held here, bounded by the pool window
+        waiting = deque()
+
+        def names():
+            for cluster in clusters:
+                waiting.append(cluster)
+                yield cluster_lookup(cluster)
+
+        for result in self.iter_lookup_properties(names()):
+            for row in waiting.popleft():
+                row.update(zip(PROPERTY_COLUMNS, result))
+                yield row
+
+    def report_lookup(self, first_name, last_name, result):
+        owner_mailing, contact_address, site_address, city, zip_code = result
+        print(f"Processed: {first_name} {last_name}")
+        print(f"  Owner Mailing: {owner_mailing}")
+        print(f"  Contact Address: {contact_address}")
+        print(f"  Site Address: {site_address}")
+        print(f"  City: {city}, Zip: {zip_code}")
+
+    def export_outputs(self, filename):
+        """Return the output files to upload for the configured output format"""
+        if self.output_format not in ('parquet', 'both'):
+            return [filename]
+        try:
+            parquet_path = export_parquet(filename)
+        except Exception as e:
+            print(f"Error exporting Parquet, uploading the CSV instead: {e}")
+            return [filename]
+        if not parquet_path:
+            return [filename]
+        print(f"Exported typed Parquet copy to {parquet_path}")
+        return [parquet_path] if self.output_format == 'parquet' else [filename, parquet_path]
+
+    def write_metrics(self):
+        """Fold in the components' own counters, print the run metrics and write the report files"""
+        metrics = self.metrics
+        metrics.set_gauge('records_per_second', metrics.rate('records.written', 'enrich'))
+        metrics.set_gauge('lookups_per_second', metrics.rate('lookups', 'enrich'))
+        if self.property_cache:
+            metrics.set_gauge('property_cache_hits', self.property_cache.hits)
+            metrics.set_gauge('property_cache_misses', self.property_cache.misses)
+        if self.parcel_index:
+            metrics.set_gauge('parcel_index_hits', self.parcel_index.hits)
+        if self.driver_pool:
+            metrics.set_gauge('driver_pool_recycled', self.driver_pool.recycled)
+            metrics.set_gauge('driver_pool_memory_recycled', self.driver_pool.memory_recycled)
+            metrics.set_gauge('driver_pool_replaced', self.driver_pool.replaced)
+        if self.drive_uploader:
+            metrics.set_gauge('drive_upload_retries', self.drive_uploader.retries)
+        metrics.set_gauge('readiness_timeouts', sum(row['timeouts'] for row in self.waits.report()))
+        print("\nRun metrics:")
+        for line in metrics.summary_lines():
+            print(line)
+        try:
+            self.metrics_paths = metrics.write(self.metrics_dir)
+            print(f"Metrics written to {', '.join(self.metrics_paths)}")
+        except Exception as e:
+            print(f"Error writing run metrics: {e}")
 
     def run(self):
         """Run the complete integrated scraping process"""
         try:
-            print("Starting integrated obituary and property scraper...")
-            self.setup_driver()
-            
-            # Scrape obituaries
-            self.scrape_legacy(self.driver)
-            self.scrape_dispatch(self.driver)
-            
-            # Convert to DataFrame and remove duplicates
-            df = pd.DataFrame(self.obituaries)
-            df = df.drop_duplicates(subset=['name', 'source'])
-            
-            # Add new columns for property information
-            df['owner_mailing'] = ''
-            df['contact_address'] = ''
-            df['site_address'] = ''
-            df['city'] = ''
-            df['zip_code'] = ''
-            
-            # Process each obituary for property information
-            print("\nSearching property records...")
-            for index, row in df.iterrows():
-                owner_mailing, contact_address, site_address, city, zip_code = self.search_property(row['first_name'], row['last_name'])
-                df.at[index, 'owner_mailing'] = owner_mailing
-                df.at[index, 'contact_address'] = contact_address
-                df.at[index, 'site_address'] = site_address
-                df.at[index, 'city'] = city
-                df.at[index, 'zip_code'] = zip_code
-                print(f"Processed: {row['first_name']} {row['last_name']}")
-                print(f"  Owner Mailing: {owner_mailing}")
-                print(f"  Contact Address: {contact_address}")
-                print(f"  Site Address: {site_address}")
-                print(f"  City: {city}, Zip: {zip_code}")
-                time.sleep(2)
+            print(f"Starting integrated obituary and property scraper for {self.county.name}...")
+            if self.parcel_index:
+                # Pick up a newly dropped bulk extract; a bad file leaves the previous index in use
+                try:
+                    with self.metrics.span('parcel_index.refresh'):
+                        self.parcel_index.refresh()
+                except Exception as e:
+                    print(f"Error refreshing parcel index: {e}")
+            if self.lookup_engine == 'selenium':
+                # Warm the lookup drivers while the listings are being scraped
+                self.get_driver_pool()
+            
+            unfinished = self.checkpoint.load()
+            if unfinished:
+                self.obituaries.add_rows(self.checkpoint.rows)
+                print(f"{'Resuming from' if self.resume else 'Carrying over unfinished'} checkpoint: "
+                      f"{len(self.obituaries)} obituaries, {len(self.checkpoint.results)} lookups already done, "
+                      f"{len(self.checkpoint.failed)} failed lookups to retry")
+            if self.resume and unfinished:
+                self.checkpoint.resume()
+            else:
+                # Scrape all sources concurrently; Chrome is only launched when a source needs it.
+                # Rows of an unfinished journal stay in the set, so a fresh scrape never drops them
+                with self.metrics.span('scrape'):
+                    scrape_all_sources(self)
+                self.checkpoint.start(self.obituaries.iter_rows())
             
             # Get current date in MM/DD/YY format
             current_date = datetime.now().strftime('%m_%d_%y')
-            filename = f'obituaries_with_property_{current_date}.csv'
+            filename = self.county.output_filename(current_date)
+            
+            # Stream each obituary through the property lookups straight into the output file,
+            # so a crash keeps every row written so far
+            print("\nSearching property records...")
+            rows = drop_duplicate_rows(self.obituaries.iter_rows(), ['name', 'source'])
+            if self.entity_resolution:
+                # One lookup per person, however many sources and name variants list them;
+                # the rows of a cluster are written together
+                with self.metrics.span('resolve'):
+                    clusters = resolve_entities(rows)
+                self.metrics.count('entities', len(clusters))
+                self.metrics.count('entities.merged_rows', sum(len(cluster) - 1 for cluster in clusters))
+                print(f"{sum(map(len, clusters))} obituaries name {len(clusters)} people")
+            else:
+                clusters = ([row] for row in rows)
+            sources_count = Counter()
+            property_count = 0
+            self.metrics.count('obituaries.scraped', len(self.obituaries))
+            with self.metrics.span('enrich'), CSVRecordSink(filename) as sink:
+                for row in self.enrich_clusters(clusters):
+                    property_count += row['owner_mailing'] != 'NOTONAUDITOR'
+                    sources_count[row['source']] += 1
+                    sink.write(row)
+            total = sum(sources_count.values())
+            self.metrics.count('records.written', total)
+            self.metrics.count('records.with_property', property_count)
+            # Every row is in the output file, so there is nothing left to resume
+            self.checkpoint.clear()
+            
+            with self.metrics.span('export'):
+                outputs = self.export_outputs(filename)
             
             # Save to Google Drive
-            if self.save_to_drive(df, filename):
-                print(f"\nSuccessfully saved {len(df)} records to Google Drive")
+            uploaded = self.upload_files_to_drive(outputs)
+            if uploaded:
+                print(f"\nSuccessfully saved {total} records to Google Drive")
+                # Not before: a run that fails short of this point must collect the same entries again
+                self.save_high_water_marks()
             else:
-                print("\nFailed to save to Google Drive, saving locally instead")
-                df.to_csv(filename, index=False)
+                print(f"\nFailed to save to Google Drive, records are saved locally in {filename}")
             
             # Print summary
             print(f"\nScraping Summary:")
-            sources_count = df['source'].value_counts()
             print("\nObituaries by source:")
-            for source, count in sources_count.items():
+            for source, count in sources_count.most_common():
                 print(f"{source}: {count}")
             
             print("\nProperty records found:")
-            property_count = len(df[df['owner_mailing'] != 'NOTONAUDITOR'])
             print(f"Records with property information: {property_count}")
-            print(f"Records without property information: {len(df) - property_count}")
+            print(f"Records without property information: {total - property_count}")
+            if self.property_cache:
+                print(f"Property cache hits: {self.property_cache.hits}")
+                print(f"Property cache misses: {self.property_cache.misses}")
+            if self.parcel_index:
+                print(f"Parcel index hits: {self.parcel_index.hits}")
+            wait_lines = self.waits.summary_lines()
+            if wait_lines:
+                print("\nReadiness waits:")
+                for line in wait_lines:
+                    print(line)
+            blocking_lines = self.request_blocker.summary_lines()
+            if blocking_lines:
+                print("\nRequest blocking:")
+                for line in blocking_lines:
+                    print(line)
+            self.metrics.set_gauge('run_success', 1)
+            
+            return {
+                'county': self.county.key,
+                'records': total,
+                'with_property': property_count,
+                'by_source': dict(sources_count),
+                'outputs': outputs,
+                'uploaded': uploaded,
+            }
             
         except Exception as e:
             print(f"Error during scraping: {e}")
+            self.metrics.set_gauge('run_success', 0)
             raise e
         finally:
+            self.checkpoint.close()
+            self.write_metrics()
+            if self.auditor_client:
+                self.auditor_client.close()
+            if self.property_cache:
+                self.property_cache.close()
+            if self.parcel_index:
+                self.parcel_index.close()
+            if self.driver_pool:
+                self.driver_pool.close()
             if self.driver:
                 try:
                     self.driver.quit()
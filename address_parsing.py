@@ -0,0 +1,43 @@
+"""Column-wise splitting of auditor city lines into city / state / zip"""
+import pandas as pd
+
+
+def _text_and_tokens(values, n):
+    """Null-safe text view of values, how many spaces each has and its last n+1 tokens"""
+    values = pd.Series(values, dtype=object)
+    is_text = values.map(lambda value: isinstance(value, str))
+    text = values.where(is_text, '').astype(str)
+    parts = text.str.rsplit(' ', n=n, expand=True).reindex(columns=range(n + 1)).fillna('').astype(object)
+    return values, is_text, text.str.count(' '), parts
+
+
+def split_city_state_zip(values):
+    """Split 'CITY NAME ST 12345' values into (city, state, zip) Series
+
+    The last two space-separated tokens are the state and zip and everything before
+    them is the city. A value with no space is kept whole as the city. Nulls stay null.
+    """
+    values, is_text, spaces, parts = _text_and_tokens(values, 2)
+    # With a single space rsplit fills only the first two columns: 'ST 12345' has no city
+    two = spaces >= 2
+    city = parts[0].where(two, '').str.strip()
+    state = parts[1].where(two, parts[0]).str.strip()
+    zip_code = parts[2].where(two, parts[1]).str.strip()
+
+    whole = ~is_text | (spaces == 0)
+    return city.mask(whole, values), state.mask(whole, None), zip_code.mask(whole, None)
+
+
+def split_city_state(values):
+    """Split 'CITY NAME ST' values into (city, state) Series; a value with no space is all city"""
+    values, is_text, spaces, parts = _text_and_tokens(values, 1)
+    whole = ~is_text | (spaces == 0)
+    return parts[0].str.strip().mask(whole, values), parts[1].str.strip().mask(whole, None)
+
+
+def split_addresses(df, contact_column='contact_address', city_column='city'):
+    """Replace the contact address and city columns with Mailing City/State/Zip and Property City/State"""
+    df = df.copy()
+    df['Mailing City'], df['Mailing State'], df['Mailing Zip'] = split_city_state_zip(df[contact_column])
+    df['Property City'], df['Property State'] = split_city_state(df[city_column])
+    return df.drop([contact_column, city_column], axis=1)
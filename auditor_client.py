@@ -0,0 +1,227 @@
+"""Browserless HTTP client for Franklin County auditor owner lookups"""
+import os
+import re
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from candidate_ranking import Person, best_candidate
+
+NOT_ON_AUDITOR = 'NOTONAUDITOR'
+NOT_FOUND = (NOT_ON_AUDITOR,) * 5
+PROPERTY_COLUMNS = ['owner_mailing', 'contact_address', 'site_address', 'city', 'zip_code']
+
+DEFAULT_BASE_URL = 'https://property.franklincountyauditor.com'
+SEARCH_PATH = '/_web/search/commonsearch.aspx?mode=owner'
+NO_RECORDS_TEXT = 'Your search did not find any records'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Row links look like: javascript:selectSearchRow('../Datalets/Datalet.aspx?sIndex=0&idx=1')
+ROW_LINK_PATTERN = re.compile(r"""['"]([^'"]*Datalet[^'"]*)['"]""", re.IGNORECASE)
+PARCEL_PATTERN = re.compile(r'^\d{3}-\d{6}')
+# Results table header words and the candidate field each column fills
+RESULT_COLUMNS = [('owner', 'owner'), ('parcel', 'parcel'), ('address', 'address'), ('location', 'address')]
+
+
+class LookupFailed(Exception):
+    """The auditor could not be searched (timeout, server error, lost form state), so nothing is known about the name
+
+    Unlike NOT_FOUND this must never be cached or journaled; the name is retried on a later run.
+    """
+
+
+def parse_form_state(html, base_url):
+    """Return (action_url, fields) for the owner search form, including ASP.NET hidden state"""
+    soup = BeautifulSoup(html, 'html.parser')
+    form = soup.find('form')
+    if form is None:
+        return base_url, {}
+
+    fields = {}
+    for element in form.find_all(['input', 'select', 'textarea']):
+        name = element.get('name')
+        if not name:
+            continue
+        input_type = (element.get('type') or 'text').lower()
+        if input_type in ('checkbox', 'radio') and not element.has_attr('checked'):
+            continue
+        if input_type in ('submit', 'button', 'image') and name != 'btSearch':
+            continue
+        if element.name == 'select':
+            option = element.find('option', selected=True) or element.find('option')
+            fields[name] = option.get('value', option.text) if option else ''
+        elif element.name == 'textarea':
+            fields[name] = element.text
+        else:
+            fields[name] = element.get('value', '')
+
+    action = urljoin(base_url, form.get('action') or base_url)
+    return action, fields
+
+
+def _row_link(row, page_url):
+    match = ROW_LINK_PATTERN.search(row.get('onclick', ''))
+    if match:
+        return urljoin(page_url, match.group(1))
+    anchor = row.find('a', href=True)
+    return urljoin(page_url, anchor['href']) if anchor else None
+
+
+def _header_columns(soup):
+    """Map results-table column positions to candidate fields from the header row, if there is one"""
+    header = soup.find('th')
+    if header is None:
+        return {}
+    columns = {}
+    for position, cell in enumerate(header.find_parent('tr').find_all(['th', 'td'])):
+        text = cell.get_text(' ', strip=True).lower()
+        for word, field in RESULT_COLUMNS:
+            if word in text and field not in columns.values():
+                columns[position] = field
+                break
+    return columns
+
+
+def parse_search_candidates(html, page_url):
+    """Parse the results table once into candidate dicts: index, url, owner, parcel and address"""
+    soup = BeautifulSoup(html, 'html.parser')
+    columns = _header_columns(soup)
+    candidates = []
+    for index, row in enumerate(soup.select('tr.SearchResults')):
+        cells = [cell.get_text(' ', strip=True) for cell in row.find_all('td')]
+        candidate = {'index': index, 'url': _row_link(row, page_url), 'owner': None, 'parcel': None, 'address': None}
+        if columns:
+            for position, field in columns.items():
+                if position < len(cells):
+                    candidate[field] = cells[position]
+        else:
+            # No header: a parcel number, an address starting with a house number, a name without digits
+            for text in cells:
+                if candidate['parcel'] is None and PARCEL_PATTERN.match(text):
+                    candidate['parcel'] = text
+                elif candidate['address'] is None and text[:1].isdigit():
+                    candidate['address'] = text
+                elif candidate['owner'] is None and text and not any(char.isdigit() for char in text):
+                    candidate['owner'] = text
+        candidates.append(candidate)
+    return candidates
+
+
+def parse_search_results(html, page_url):
+    """Return absolute datalet URLs for every tr.SearchResults row, in page order"""
+    return [candidate['url'] for candidate in parse_search_candidates(html, page_url) if candidate['url']]
+
+
+def is_datalet_page(html):
+    return 'DataletSideHeading' in html
+
+
+def parse_datalet(html):
+    """Extract (owner_mailing, contact_address, site_address, city, zip_code) from a datalet page"""
+    owner_mailing = NOT_ON_AUDITOR
+    contact_address = NOT_ON_AUDITOR
+    site_address = NOT_ON_AUDITOR
+    city = NOT_ON_AUDITOR
+    zip_code = NOT_ON_AUDITOR
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for row in soup.find_all('tr'):
+        heading_cell = row.find(class_='DataletSideHeading')
+        data_cell = row.find(class_='DataletData')
+        if heading_cell is None or data_cell is None:
+            continue
+        heading = heading_cell.get_text(' ', strip=True)
+        data = data_cell.get_text('\n', strip=True)
+
+        if "Owner Mailing" in heading and "Contact Address" not in heading:
+            owner_mailing = data
+        elif "Contact Address" in heading:
+            contact_address = data
+        elif "Site (Property) Address" in heading:
+            site_address = data
+        elif "City/Village" in heading:
+            city = data
+        elif "Zip Code" in heading:
+            zip_code = data
+
+    return owner_mailing, contact_address, site_address, city, zip_code
+
+
+class AuditorHTTPClient:
+    """Owner search against the auditor site over a pooled HTTP session instead of Chrome"""
+
+    def __init__(self, base_url=None, timeout=15, pool_size=4):
+        self.base_url = (base_url or os.getenv('AUDITOR_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.search_url = self.base_url + SEARCH_PATH
+        self.timeout = timeout
+
+        # ASP.NET answers transient session and view state trouble with a 500. A retry re-sends
+        # the same request, so a postback whose view state has gone stale still fails and is
+        # left to LookupFailed; the name is then searched again with a fresh form on --resume
+        retry = Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=None
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        # Searches that failed with LookupFailed
+        self.errors = 0
+        # Result pages where no row matched the obituary well enough to open
+        self.rejected = 0
+
+    def search_property(self, first_name, last_name, hints=None):
+        """Search property information for a given name, returning the same 5-tuple as the Selenium path
+
+        `hints` may carry the obituary's full_name and location, used to pick among several owners.
+        Raises LookupFailed when the site could not answer.
+        """
+        try:
+            # Load the search form to pick up __VIEWSTATE/__EVENTVALIDATION
+            response = self.session.get(self.search_url, timeout=self.timeout)
+            response.raise_for_status()
+            action, fields = parse_form_state(response.text, response.url)
+
+            fields['inpOwner'] = f"{last_name} {first_name}"
+            if 'hdAction' in fields:
+                fields['hdAction'] = 'Search'
+
+            response = self.session.post(action, data=fields, timeout=self.timeout)
+            response.raise_for_status()
+            html = response.text
+
+            if NO_RECORDS_TEXT in html:
+                return NOT_FOUND
+
+            # A single match is redirected straight to its datalet page
+            if not is_datalet_page(html):
+                candidates = parse_search_candidates(html, response.url)
+                if not candidates:
+                    # Not a results table either, e.g. the form again after the session expired
+                    raise LookupFailed("auditor returned neither results, a datalet nor the no-records notice")
+                # Only the best-matching owner's datalet is fetched, and none if no row fits
+                best = best_candidate(candidates, Person(first_name, last_name, **(hints or {})))
+                if best is None or not best['url']:
+                    self.rejected += 1
+                    return NOT_FOUND
+                response = self.session.get(best['url'], timeout=self.timeout)
+                response.raise_for_status()
+                html = response.text
+                if not is_datalet_page(html):
+                    raise LookupFailed("auditor result link did not open a datalet")
+
+            return parse_datalet(html)
+
+        except Exception as e:
+            self.errors += 1
+            raise LookupFailed(str(e)) from e
+
+    def close(self):
+        self.session.close()
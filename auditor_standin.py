@@ -0,0 +1,332 @@
+"""Local stand-in for the auditor's CommonSearch owner search, for load and concurrency testing
+
+Serves the same flow search_property walks: the owner search form with ASP.NET hidden
+state, the inpOwner post, the no-records page, tr.SearchResults tables with one or many
+rows, a single match redirected to its datalet, and datalet pages of
+DataletSideHeading/DataletData rows. Latency, error rate and a request rate limit are
+configurable. Results are derived from a hash of the searched name, so a name always
+gets the same answer.
+
+Usage: python auditor_standin.py [--port 8765] [--latency 0.2] [--jitter 0.1] [--error-rate 0.02] [--rate-limit 5]
+       AUDITOR_BASE_URL=http://127.0.0.1:8765 python run_scraper.py --engine http
+"""
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+from auditor_client import NO_RECORDS_TEXT
+
+SEARCH_PAGE = '/_web/search/commonsearch.aspx'
+DATALET_PAGE = '/_web/datalets/datalet.aspx'
+STATS_PAGE = '/_standin/stats'
+VIEWSTATE = 'dDwtMTA4MTcyOTQ3Nzs7Pp4vDSHUQ6GB8Bkpx6dSXQ6wTVzl'
+EVENTVALIDATION = 'wEWBAKk8uKQDgK7hfXVAwKMlNjJBQL8v5HdCQ'
+STREETS = ['MAIN ST', 'HIGH ST', 'BROAD ST', 'MAPLE AVE', 'OAK DR', 'LINCOLN RD', 'PARK PL', 'CHERRY LN']
+CITIES = ['COLUMBUS', 'WESTERVILLE', 'DUBLIN', 'GROVE CITY', 'HILLIARD', 'GAHANNA', 'REYNOLDSBURG']
+OTHER_FIRST = ['ROBERT', 'MARY', 'JAMES', 'LINDA', 'DAVID', 'SUSAN']
+
+PAGE = """<!DOCTYPE html><html><head><title>{title}</title>
+<script>function selectSearchRow(url) {{ window.location.href = url; }}</script></head>
+<body>{body}</body></html>"""
+
+SEARCH_FORM = """<form name="frmMain" method="post" action="./CommonSearch.aspx?mode=OWNER">
+<input type="hidden" name="__VIEWSTATE" value="{viewstate}">
+<input type="hidden" name="__EVENTVALIDATION" value="{eventvalidation}">
+<input type="hidden" name="hdAction" value="">
+<input type="hidden" name="hdMode" value="OWNER">
+<label for="inpOwner">Owner</label><input type="text" id="inpOwner" name="inpOwner" value="">
+<input type="submit" name="btSearch" id="btSearch" value="Search">
+<input type="submit" name="btClear" id="btClear" value="Clear">
+{notice}</form>"""
+
+
+def _digest(text):
+    return int(hashlib.sha1(text.upper().encode('utf-8')).hexdigest(), 16)
+
+
+class StandInConfig:
+    """How the stand-in behaves; every rate is a fraction of requests or searches"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=0.0, rate_limit_status=429,
+                 not_found_rate=0.3, multi_rate=0.2, max_rows=25, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_status = rate_limit_status
+        self.not_found_rate = not_found_rate
+        self.multi_rate = multi_rate
+        self.max_rows = max_rows
+        self.random = random.Random(seed)
+
+
+class AuditorStandIn:
+    """Threaded HTTP server answering CommonSearch owner searches from synthetic parcels"""
+
+    def __init__(self, host='127.0.0.1', port=0, config=None):
+        self.config = config or StandInConfig()
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'searches': 0, 'not_found': 0, 'single': 0, 'multiple': 0,
+                      'datalets': 0, 'errors': 0, 'rate_limited': 0}
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def admit(self):
+        """Fixed one-second window limiter; False once this second's budget is spent"""
+        if not self.config.rate_limit:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 1.0:
+                self.window_start = now
+                self.window_count = 0
+            self.window_count += 1
+            return self.window_count <= self.config.rate_limit
+
+    def delay(self):
+        config = self.config
+        if config.latency or config.jitter:
+            with self.lock:
+                jitter = config.random.uniform(-config.jitter, config.jitter) if config.jitter else 0.0
+            time.sleep(max(0.0, config.latency + jitter))
+
+    def fails(self):
+        if not self.config.error_rate:
+            return False
+        with self.lock:
+            return self.config.random.random() < self.config.error_rate
+
+    def matches(self, query):
+        """How many parcels an owner query returns: 0, 1 or several, fixed per name"""
+        query = ' '.join(query.split())
+        if not query:
+            return 0
+        roll = (_digest(query) % 10000) / 10000
+        if roll < self.config.not_found_rate:
+            return 0
+        if roll < self.config.not_found_rate + self.config.multi_rate:
+            return 2 + _digest('rows ' + query) % max(1, self.config.max_rows - 1)
+        return 1
+
+    def owner_variant(self, owner, index):
+        """The owner listed on the index-th row of a multi-row search; index 0 is the searched name itself
+
+        Rows of one search list relatives, trusts, initials and businesses under the same
+        surname, and sometimes no row with the searched first name at all.
+        """
+        words = owner.split()
+        if index == 0 or len(words) < 2:
+            return owner
+        last, first = words[0], ' '.join(words[1:])
+        variant = _digest(f"variant {owner} {index}") % 7
+        if _digest('absent ' + owner) % 4 == 0:
+            # A namesake search: every row is some other member of the family
+            first = OTHER_FIRST[_digest(owner) % len(OTHER_FIRST)]
+            owner = f"{last} {first}"
+        if variant == 1:
+            return f"{owner} JR"
+        if variant == 2:
+            return f"{last} {OTHER_FIRST[index % len(OTHER_FIRST)]}"
+        if variant == 3:
+            return f"{last} {first[0]}"
+        if variant == 4:
+            return f"{owner} TR"
+        if variant == 5:
+            return f"{last} PROPERTIES LLC"
+        if variant == 6:
+            return f"{owner} & {OTHER_FIRST[index % len(OTHER_FIRST)]}"
+        return owner
+
+    def parcel(self, owner, index):
+        """Synthetic datalet fields for the index-th parcel of an owner"""
+        value = _digest(f"{owner} {index}")
+        street = f"{value % 9000 + 100} {STREETS[value % len(STREETS)]}"
+        city = CITIES[(value // 7) % len(CITIES)]
+        zip_code = str(43000 + value % 300)
+        return {
+            'owner': self.owner_variant(owner.upper(), index),
+            'street': street,
+            'city': city,
+            'zip': zip_code,
+            'parcel': f"{value % 600 + 10:03d}-{value % 1000000:06d}-00",
+        }
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def send_page(self, body, status=200, headers=None, content_type='text/html; charset=utf-8'):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def gate(self):
+                """Apply the rate limit, latency and injected errors; False if the request was answered"""
+                standin.count('requests')
+                if not standin.admit():
+                    standin.count('rate_limited')
+                    self.send_page('<h1>Too Many Requests</h1>', standin.config.rate_limit_status, {'Retry-After': '1'})
+                    return False
+                standin.delay()
+                if standin.fails():
+                    standin.count('errors')
+                    self.send_page('<h1>Server Error in \'/\' Application.</h1>', 500)
+                    return False
+                return True
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path = parts.path.lower()
+                if path == STATS_PAGE:
+                    return self.send_page(json.dumps(standin.snapshot()), content_type='application/json')
+                if not self.gate():
+                    return
+                if path == SEARCH_PAGE:
+                    return self.send_page(search_page())
+                if path == DATALET_PAGE:
+                    query = parse_qs(parts.query)
+                    owner = query.get('owner', [''])[0]
+                    index = int(query.get('idx', ['0'])[0] or 0)
+                    standin.count('datalets')
+                    return self.send_page(datalet_page(standin.parcel(owner, index)))
+                self.send_page('<h1>404 Not Found</h1>', 404)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                form = parse_qs(self.rfile.read(length).decode('utf-8'), keep_blank_values=True)
+                if urlsplit(self.path).path.lower() != SEARCH_PAGE:
+                    return self.send_page('<h1>404 Not Found</h1>', 404)
+                if not self.gate():
+                    return
+                if form.get('__VIEWSTATE', [''])[0] != VIEWSTATE:
+                    # ASP.NET rejects a postback without the page's view state
+                    standin.count('errors')
+                    return self.send_page('<h1>Validation of viewstate MAC failed.</h1>', 500)
+
+                owner = ' '.join(form.get('inpOwner', [''])[0].split()).upper()
+                standin.count('searches')
+                rows = standin.matches(owner)
+                if rows == 0:
+                    standin.count('not_found')
+                    return self.send_page(search_page(f"<large>{NO_RECORDS_TEXT}</large>"))
+                if rows == 1:
+                    standin.count('single')
+                    # A single match goes straight to its datalet
+                    return self.send_page('', 302, {'Location': datalet_link(owner, 0)})
+                standin.count('multiple')
+                return self.send_page(results_page([standin.parcel(owner, index) for index in range(1, rows + 1)], owner))
+
+        return Handler
+
+
+def datalet_link(owner, index):
+    return f"../Datalets/Datalet.aspx?sIndex=0&idx={index}&owner={quote(owner)}"
+
+
+def search_page(notice=''):
+    form = SEARCH_FORM.format(viewstate=VIEWSTATE, eventvalidation=EVENTVALIDATION, notice=notice)
+    return PAGE.format(title='Owner Search', body=form)
+
+
+def results_page(parcels, owner):
+    rows = ''.join(
+        f"""<tr class="SearchResults" onclick="javascript:selectSearchRow('{datalet_link(owner, index)}')">"""
+        f"<td>{parcel['parcel']}</td><td>{html.escape(parcel['owner'])}</td><td>{parcel['street']}</td></tr>"
+        for index, parcel in enumerate(parcels, 1)
+    )
+    table = ('<table id="searchResults"><tr><th>Parcel ID</th><th>Owner</th><th>Address</th></tr>'
+             f"{rows}</table>")
+    return PAGE.format(title='Search Results', body=table)
+
+
+def datalet_page(parcel):
+    fields = [
+        ('Parcel ID', parcel['parcel']),
+        ('Owner', html.escape(parcel['owner'])),
+        ('Owner Mailing', html.escape(parcel['owner'])),
+        ('Contact Address', f"{parcel['street']}<br>{parcel['city']} OH {parcel['zip']}"),
+        ('Site (Property) Address', parcel['street']),
+        ('City/Village', f"{parcel['city']} OH"),
+        ('Zip Code', parcel['zip']),
+        ('Land Use', '510 - ONE-FAMILY DWLG ON PLATTED LOT'),
+    ]
+    rows = ''.join(f'<tr><td class="DataletSideHeading">{heading}</td><td class="DataletData">{data}</td></tr>'
+                   for heading, data in fields)
+    return PAGE.format(title='Parcel', body=f'<table class="DataletTable">{rows}</table>')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the auditor owner search")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every page")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Uniform +/- seconds around the latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument('--rate-limit', type=float, default=0.0, help="Requests per second before throttling, 0 for none")
+    parser.add_argument('--rate-limit-status', type=int, default=429, help="Status of throttled responses (429 or 503)")
+    parser.add_argument('--not-found-rate', type=float, default=0.3, help="Fraction of names with no records")
+    parser.add_argument('--multi-rate', type=float, default=0.2, help="Fraction of names with several parcels")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    config = StandInConfig(args.latency, args.jitter, args.error_rate, args.rate_limit, args.rate_limit_status,
+                           args.not_found_rate, args.multi_rate, seed=args.seed)
+    standin = AuditorStandIn(args.host, args.port, config)
+    print(f"Auditor stand-in listening on {standin.url} (stats at {standin.url}{STATS_PAGE})")
+    try:
+        standin.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
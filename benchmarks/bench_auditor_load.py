@@ -0,0 +1,172 @@
+"""Load-test auditor lookups against the local stand-in: throughput, tail latency and outcomes
+
+Starts an in-process auditor_standin (or targets --url) and pushes names through the
+same PropertyLookupPool and lookup sessions the scraper uses.
+
+Usage: python benchmarks/bench_auditor_load.py [--names 500] [--workers 1,4,8] [--rate 0]
+                                               [--latency 0.2] [--jitter 0.1] [--error-rate 0.02]
+                                               [--rate-limit 0] [--engine http|selenium] [--url URL] [--json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from auditor_client import AuditorHTTPClient, NOT_FOUND
+from auditor_standin import STATS_PAGE, AuditorStandIn, StandInConfig
+from lookup_pool import PropertyLookupPool
+
+FIRST = ['John', 'Mary', 'Robert', 'Patricia', 'James', 'Linda', 'William', 'Barbara', 'David', 'Susan']
+LAST = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Miller', 'Davis', 'Wilson', 'Anderson', 'Taylor']
+
+
+class TimedSession:
+    """Wrap a lookup session to record the latency of every search"""
+
+    def __init__(self, session, latencies, lock):
+        self.session = session
+        self.latencies = latencies
+        self.lock = lock
+        self.errors = 0
+
+    def search_property(self, *name):
+        start = time.perf_counter()
+        try:
+            return self.session.search_property(*name)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.latencies.append(elapsed)
+
+    @property
+    def rejected(self):
+        return getattr(self.session, 'rejected', 0)
+
+    def close(self):
+        self.session.close()
+
+
+def make_names(count):
+    return [(f"{FIRST[i % len(FIRST)]}{i}", LAST[(i // len(FIRST)) % len(LAST)]) for i in range(count)]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(q * len(values) + 0.5)) - 1))]
+
+
+def session_factory(engine, url):
+    if engine == 'http':
+        return lambda: AuditorHTTPClient(base_url=url)
+    # Chrome sessions come from the scraper's own driver pool, pointed at the stand-in
+    from IntegratedObituaryPropertyScraper import IntegratedObituaryPropertyScraper
+    os.environ['AUDITOR_BASE_URL'] = url
+    scraper = IntegratedObituaryPropertyScraper(lookup_engine='selenium', use_cache=False)
+    return scraper.create_lookup_session
+
+
+def run_load(url, names, workers, rate, engine):
+    latencies = []
+    lock = threading.Lock()
+    sessions = []
+    factory = session_factory(engine, url)
+
+    def timed_factory():
+        session = TimedSession(factory(), latencies, lock)
+        sessions.append(session)
+        return session
+
+    pool = PropertyLookupPool(timed_factory, workers=workers, rate_per_second=rate)
+    start = time.perf_counter()
+    # Per-lookup error messages go to stderr so the report stays readable and --json stays parseable
+    with contextlib.redirect_stdout(sys.stderr):
+        results = list(pool.imap(names))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    errors = sum(session.errors for session in sessions)
+    rejected = sum(session.rejected for session in sessions)
+    not_found = sum(result == NOT_FOUND for result in results)
+    return {
+        'workers': workers,
+        'lookups': len(results),
+        'seconds': round(elapsed, 3),
+        'lookups_per_second': round(len(results) / elapsed, 2) if elapsed else None,
+        'found': len(results) - not_found,
+        'not_found': not_found - errors - rejected,
+        'rejected': rejected,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+        'p90_ms': round(percentile(latencies, 0.90) * 1000, 1) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+        'max_ms': round(latencies[-1] * 1000, 1) if latencies else None,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+    }
+
+
+def server_stats(url):
+    try:
+        return requests.get(url + STATS_PAGE, timeout=5).json()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure lookup throughput and tail latency against the auditor stand-in")
+    parser.add_argument('--names', type=int, default=500)
+    parser.add_argument('--workers', default='1,4,8', help="Comma-separated worker counts to compare")
+    parser.add_argument('--rate', type=float, default=0, help="Client-side lookups per second, 0 for unlimited")
+    parser.add_argument('--engine', choices=['http', 'selenium'], default='http')
+    parser.add_argument('--url', help="Existing stand-in or auditor URL instead of an in-process stand-in")
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0.1)
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--rate-limit', type=float, default=0)
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args()
+
+    standin = None
+    url = args.url
+    if not url:
+        config = StandInConfig(args.latency, args.jitter, args.error_rate, args.rate_limit, seed=1)
+        standin = AuditorStandIn(config=config).start()
+        url = standin.url
+
+    names = make_names(args.names)
+    runs = []
+    try:
+        for workers in [int(value) for value in args.workers.split(',')]:
+            before = server_stats(url)
+            result = run_load(url, names, workers, args.rate, args.engine)
+            after = server_stats(url)
+            if before and after:
+                result['server'] = {key: after[key] - before.get(key, 0) for key in after}
+            runs.append(result)
+            if not args.json:
+                print(f"workers {workers:3}: {result['lookups_per_second']:7.2f} lookups/s  "
+                      f"p50 {result['p50_ms']}ms  p90 {result['p90_ms']}ms  p99 {result['p99_ms']}ms  "
+                      f"max {result['max_ms']}ms  found {result['found']}  not found {result['not_found']}  "
+                      f"rejected {result['rejected']}  errors {result['errors']}"
+                      + (f"  throttled {result['server']['rate_limited']}" if result.get('server') else ''))
+    finally:
+        if standin:
+            standin.stop()
+
+    if args.json:
+        print(json.dumps({'url': url, 'engine': args.engine, 'names': args.names, 'runs': runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
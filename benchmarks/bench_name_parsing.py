@@ -0,0 +1,83 @@
+"""Benchmark the batch name parser against the original per-call split_name
+
+Usage: python benchmarks/bench_name_parsing.py [names] [distinct]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from name_parsing import split_name, split_names
+
+FIRST = ['John', 'Mary', 'Robert', 'Patricia', 'James', 'Linda', 'Dr.', 'Dr', 'William', 'Barbara', 'Li']
+MIDDLE = ['', 'A.', 'Lee', 'Marie', 'J', '"Bud"', '(Sonny)', '[Peggy]']
+LAST = ['Smith', 'Johnson', 'Williams', 'Brown', "O'Neil", 'Van Buren', 'Garcia-Lopez', 'Miller', 'Davis']
+SUFFIX = ['', 'Jr.', 'Sr', 'II', 'III', 'IV', 'V', 'Tr', 'M']
+TAIL = ['', ' 1938-2024', ' October 12, 2024', ' (née Brown)']
+MONTHS = r'(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+
+
+def split_name_original(full_name):
+    """split_name as it was before name_parsing, kept as the baseline"""
+    name_without_dates = re.sub(r'\s*\d{4}-\d{4}\s*$', '', full_name.strip())
+    name_without_dates = re.sub(r'\s*' + MONTHS + r'\s+\d{1,2},\s+\d{4}\s*$', '', name_without_dates)
+    name_without_nickname = re.sub(r'\s*[\(\[].+?[\)\]]\s*', '', name_without_dates)
+    parts = [part for part in name_without_nickname.strip().split() if part]
+
+    if len(parts) >= 2:
+        if parts[0].lower().replace('.', '') == 'dr':
+            first_name = parts[1] if len(parts) > 2 else parts[0]
+        else:
+            first_name = parts[0]
+
+        last_word = parts[-1].lower().replace('.', '')
+        if (last_word in ['jr', 'sr', 'ii', 'iii', 'iv', 'v', 'tr'] or
+                (len(last_word) == 1 and last_word.isalpha())):
+            last_name = parts[-2] if len(parts) > 1 else parts[-1]
+        else:
+            last_name = parts[-1]
+
+        return first_name, last_name, ' '.join(parts)
+
+    return full_name, '', full_name
+
+
+def make_corpus(size, distinct, seed=11):
+    """`size` raw card names drawn from `distinct` names, the way scroll steps repeat cards"""
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(distinct):
+        words = [rng.choice(FIRST), rng.choice(MIDDLE), rng.choice(FIRST[:-2]), rng.choice(LAST), rng.choice(SUFFIX)]
+        pool.append(' '.join(word for word in words if word) + rng.choice(TAIL))
+    pool.extend(['Cher', '  ', 'Smith'])
+    return [rng.choice(pool) for _ in range(size)]
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28}{time.perf_counter() - start:.3f}s")
+    return result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    corpus = make_corpus(size, distinct)
+    print(f"names: {size} ({distinct} distinct)")
+
+    expected = timed("original split_name:", lambda: [split_name_original(name) for name in corpus])
+    split_name.cache_clear()
+    scalar = timed("memoized split_name:", lambda: [split_name(name) for name in corpus])
+    split_name.cache_clear()
+    batch = timed("split_names (batch):", lambda: split_names(corpus))
+
+    assert scalar == expected
+    assert list(batch.itertuples(index=False, name=None)) == expected
+    print(f"cache: {split_name.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
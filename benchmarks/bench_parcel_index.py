@@ -0,0 +1,102 @@
+"""Benchmark the offline parcel index: full extract load, incremental reload and per-name lookup time
+
+Usage: python benchmarks/bench_parcel_index.py [parcels] [--changed 0.01]
+"""
+import argparse
+import csv
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from parcel_index import ParcelIndex
+
+FIRST = ['JOHN', 'MARY', 'ROBERT', 'PATRICIA', 'JAMES', 'LINDA', 'WILLIAM', 'BARBARA', 'DAVID', 'SUSAN']
+LAST = ['SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'MILLER', 'DAVIS', 'WILSON', 'ANDERSON', 'TAYLOR']
+STREETS = ['MAIN ST', 'HIGH ST', 'BROAD ST', 'MAPLE AVE', 'OAK DR', 'LINCOLN RD']
+CITIES = ['COLUMBUS', 'WESTERVILLE', 'DUBLIN', 'GROVE CITY', 'HILLIARD']
+HEADER = ['PARCEL ID', 'OWNER NAME 1', 'OWNER NAME 2', 'MAIL ADDRESS', 'MAIL CITY', 'MAIL STATE', 'MAIL ZIP',
+          'SITE ADDRESS', 'SITE CITY', 'SITE ZIP']
+
+
+def make_rows(count, rng, start=0):
+    rows = []
+    for i in range(start, start + count):
+        last = f"{rng.choice(LAST)}{i % 5000}"
+        first = rng.choice(FIRST)
+        owner = f"{last} {first} {rng.choice('ABCDE')}"
+        owner2 = f"{rng.choice(FIRST)}" if rng.random() < 0.3 else ''
+        street = f"{rng.randint(100, 9999)} {rng.choice(STREETS)}"
+        city = rng.choice(CITIES)
+        zip_code = str(43000 + rng.randint(0, 300))
+        rows.append([f"{i // 1000000:03d}-{i % 1000000:06d}-00", owner + (f" & {owner2}" if owner2 else ''), '',
+                     street, city, 'OH', zip_code, street, city, zip_code])
+    return rows
+
+
+def write_extract(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the parcel index load, incremental reload and lookups")
+    parser.add_argument('parcels', nargs='?', type=int, default=200000)
+    parser.add_argument('--changed', type=float, default=0.01, help="Share of parcels changed in the second extract")
+    parser.add_argument('--lookups', type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    workdir = tempfile.mkdtemp()
+    try:
+        extract_dir = os.path.join(workdir, 'extracts')
+        os.makedirs(extract_dir)
+        rows = make_rows(args.parcels, rng)
+        write_extract(os.path.join(extract_dir, 'parcels_1.csv'), rows)
+        index = ParcelIndex(path=os.path.join(workdir, 'index.sqlite3'), extract_dir=extract_dir)
+
+        start = time.perf_counter()
+        index.refresh()
+        full_load = time.perf_counter() - start
+
+        # A later extract: a few owners change, a few parcels are split off or retired
+        changed = int(len(rows) * args.changed)
+        for row in rng.sample(rows, changed):
+            row[1] = f"{rng.choice(LAST)} {rng.choice(FIRST)}"
+        rows = rows[changed // 2:] + make_rows(changed // 2, rng, start=args.parcels)
+        second = os.path.join(extract_dir, 'parcels_2.csv')
+        write_extract(second, rows)
+        os.utime(second, (time.time() + 1, time.time() + 1))
+        start = time.perf_counter()
+        summary = index.refresh()
+        incremental = time.perf_counter() - start
+
+        names = [(row[1].split()[1], row[1].split()[0]) for row in rng.sample(rows, min(args.lookups, len(rows)))]
+        timings = []
+        for first_name, last_name in names:
+            start = time.perf_counter()
+            index.lookup(first_name, last_name)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+
+        size = os.path.getsize(index.path)
+        print(f"{args.parcels} parcels, index {size / 1e6:.1f} MB")
+        print(f"full load:        {full_load:8.2f} s")
+        print(f"incremental load: {incremental:8.2f} s  ({summary['added']} added, {summary['changed']} changed, "
+              f"{summary['removed']} removed)")
+        print(f"lookup:           p50 {timings[len(timings) // 2] * 1e6:.0f} us  "
+              f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.0f} us  mean {statistics.mean(timings) * 1e6:.0f} us  "
+              f"hits {index.hits}/{len(names)}")
+        index.close()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
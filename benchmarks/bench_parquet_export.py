@@ -0,0 +1,95 @@
+"""Compare a month of daily output files as CSV and as typed Parquet: bytes on disk and load time
+
+Usage: python benchmarks/bench_parquet_export.py [rows_per_day] [days]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from parquet_export import export_parquet, typed_frame
+
+FIRST = ['John', 'Mary', 'Robert', 'Patricia', 'James', 'Linda', 'William', 'Barbara', 'David', 'Susan']
+LAST = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Miller', 'Davis', 'Wilson', 'Anderson', 'Taylor']
+CITIES = ['COLUMBUS', 'NEW ALBANY', 'GROVE CITY', 'UPPER ARLINGTON', 'WESTERVILLE', 'DUBLIN']
+
+
+def make_day(rows, day, rng):
+    """One day's output in the run() CSV layout, with most names not on the auditor site"""
+    records = []
+    for _ in range(rows):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        listed = day - timedelta(days=rng.randint(0, 6))
+        found = rng.random() < 0.3
+        city = rng.choice(CITIES)
+        street = f"{rng.randint(10, 9999)} {rng.choice(LAST).upper()} RD"
+        records.append({
+            'first_name': first,
+            'last_name': last,
+            'name': f"{first} {last}",
+            'date': listed.strftime('%B %d, %Y').replace(' 0', ' '),
+            'source': rng.choice(['legacy.com', 'dispatch.com']),
+            'age': str(rng.randint(40, 101)) if rng.random() < 0.6 else 'N/A',
+            'location': rng.choice(['Ohio', 'Columbus, OH', 'N/A']),
+            'Tag': 'Obituary-Ahmed fetched',
+            'owner_mailing': f"{first.upper()} {last.upper()}" if found else 'NOTONAUDITOR',
+            'contact_address': f"{city} OH {rng.randint(43000, 43299)}" if found else 'NOTONAUDITOR',
+            'site_address': street if found else 'NOTONAUDITOR',
+            'city': f"{city} OH" if found else 'NOTONAUDITOR',
+            'zip_code': str(rng.randint(43000, 43299)) if found else 'NOTONAUDITOR',
+        })
+    return pd.DataFrame(records)
+
+
+def best_seconds(load, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def load_csv_month(paths, typed=False):
+    frames = [pd.read_csv(path, dtype=str, keep_default_na=False) for path in paths]
+    df = pd.concat(frames, ignore_index=True)
+    return typed_frame(df) if typed else df
+
+
+def main():
+    rows_per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    rng = random.Random(5)
+    workdir = tempfile.mkdtemp(prefix='bench_parquet_')
+
+    csv_paths, parquet_paths = [], []
+    for offset in range(days):
+        day = date(2024, 10, 1) + timedelta(days=offset)
+        path = os.path.join(workdir, f"obituaries_with_property_{day.strftime('%m_%d_%y')}.csv")
+        make_day(rows_per_day, day, rng).to_csv(path, index=False)
+        csv_paths.append(path)
+        parquet_paths.append(export_parquet(path))
+
+    csv_bytes = sum(os.path.getsize(path) for path in csv_paths)
+    parquet_bytes = sum(os.path.getsize(path) for path in parquet_paths)
+    csv_load = best_seconds(lambda: load_csv_month(csv_paths))
+    # What analytics pays today to get the same dates, ages, categoricals and nulls out of CSV
+    csv_typed_load = best_seconds(lambda: load_csv_month(csv_paths, typed=True))
+    parquet_load = best_seconds(lambda: pd.read_parquet(parquet_paths))
+
+    print(f"files: {days} x {rows_per_day} rows")
+    print(f"CSV:             {csv_bytes / 1e6:8.1f} MB, load {csv_load:.2f}s, load + typing {csv_typed_load:.2f}s")
+    print(f"Parquet:         {parquet_bytes / 1e6:8.1f} MB, load {parquet_load:.2f}s")
+    print(f"size ratio {csv_bytes / parquet_bytes:.1f}x, load ratio {csv_load / parquet_load:.1f}x raw, "
+          f"{csv_typed_load / parquet_load:.1f}x typed")
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
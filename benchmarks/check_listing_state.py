@@ -0,0 +1,60 @@
+"""Check the browserless listing decoder against the synthetic legacy.com listing-state fixture
+
+Decodes benchmarks/fixtures/listing_state.html through the legacy.com adapter and compares
+the records with listing_state_expected.json, which make_fixtures.py wrote from the data it
+generated. Then drops the embedded state and checks that the rendered-card fallback still
+finds every (date header, name). Exits 1 on any difference.
+
+This tests the decoder only: make_fixtures.py places the listing at the adapter's own state
+path, which has not been checked against a live page. A wrong path passes here and shows up
+on the real site as the fallback message from SourceAdapter.extract.
+
+Usage: python benchmarks/check_listing_state.py
+"""
+import json
+import os
+import re
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+from sources import LegacyAdapter
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+NEXT_DATA_PATTERN = re.compile(r'<script id="__NEXT_DATA__".*?</script>', re.DOTALL)
+
+
+def compare(label, decoded, expected):
+    """Print the first differences; return True when the record lists are equal"""
+    if decoded == expected:
+        print(f"{label}: {len(decoded)} records match")
+        return True
+    print(f"{label}: {len(decoded)} records decoded, {len(expected)} expected")
+    missing = [record for record in expected if record not in decoded]
+    extra = [record for record in decoded if record not in expected]
+    for record in missing[:5]:
+        print(f"  missing {record}")
+    for record in extra[:5]:
+        print(f"  unexpected {record}")
+    if not missing and not extra:
+        print("  same records in a different order")
+    return False
+
+
+def main():
+    with open(os.path.join(FIXTURE_DIR, 'listing_state.html'), encoding='utf-8') as f:
+        html = f.read().replace('<!-- repeat -->', '').replace('<!-- /repeat -->', '')
+    with open(os.path.join(FIXTURE_DIR, 'listing_state_expected.json'), encoding='utf-8') as f:
+        expected = [tuple(record) for record in json.load(f)]
+
+    # The adapter never touches the scraper just to extract
+    adapter = LegacyAdapter(scraper=None)
+    print("Synthetic fixture: checks the decoder, not the live state path")
+    ok = compare('page state', adapter.extract(html), expected)
+    ok = compare('rendered cards', [card[:2] for card in adapter.extract(NEXT_DATA_PATTERN.sub('', html))],
+                 [record[:2] for record in expected]) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
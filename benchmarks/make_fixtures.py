@@ -0,0 +1,229 @@
+"""Regenerate the HTML fixtures in benchmarks/fixtures
+
+The pages reproduce the markup the parsers key on (legacy.com person cards and date
+headers, dispatch.com MUI cards, CommonSearch result rows and datalet tables) plus the
+surrounding page weight, from a fixed seed so every regeneration is identical. The
+listing body of each page sits between <!-- repeat --> and <!-- /repeat --> markers,
+which run_benchmarks.py duplicates to build the 10x pages.
+
+listing_state.html is a synthetic legacy.com listing as fetched over HTTP: Next.js state
+next to trending lists, ads and ld+json that must not become records, and the
+server-rendered cards. The listing is placed at LegacyAdapter's unverified state path, so
+the fixture exercises the decoder but cannot show that the path matches the live site.
+listing_state_expected.json holds the records the generator put into the listing state,
+for check_listing_state.py.
+
+Usage: python benchmarks/make_fixtures.py
+"""
+import json
+import os
+import random
+from datetime import date, timedelta
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+FIRST = ['John', 'Mary', 'Robert', 'Patricia', 'James', 'Linda', 'William', 'Barbara', 'David', 'Susan',
+         'Richard', 'Jessica', 'Joseph', 'Sarah', 'Thomas', 'Karen', 'Charles', 'Nancy', 'Dr.', 'Li']
+MIDDLE = ['', '', '', 'A.', 'Lee', 'Marie', 'J.', '"Bud"', '(Sonny)', 'Ann']
+LAST = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', "O'Neil", 'Van Buren', 'Garcia-Lopez', 'Miller',
+        'Davis', 'Wilson', 'Anderson', 'Taylor', 'Thomas', 'Moore', 'Martin', 'Jackson', 'White', 'Harris']
+SUFFIX = ['', '', '', '', 'Jr.', 'Sr.', 'II', 'III']
+CITIES = ['Columbus', 'Westerville', 'Dublin', 'Grove City', 'Hilliard', 'Gahanna', 'Reynoldsburg', 'Upper Arlington']
+FUNERAL_HOMES = ['Schoedinger', 'Egan-Ryan', 'Tidd Family', 'Rutherford-Corbin', 'Spears-Bernard']
+
+# Stand-ins for the framework bundles and tracking markup that make up most of a real page
+PAGE_HEAD = """<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<link rel="preload" href="/static/fonts/main.woff2" as="font" crossorigin>
+<script>window.dataLayer=window.dataLayer||[];function gtag(){{dataLayer.push(arguments)}}gtag('js',new Date());</script>
+<style>{style}</style></head><body>
+<nav class="site-nav">{nav}</nav>
+"""
+PAGE_FOOT = """<footer class="site-footer">{links}</footer>
+<script src="/static/js/framework.js" defer></script><script src="/static/js/main.js" defer></script>
+</body></html>
+"""
+
+
+def person_name(rng):
+    parts = [rng.choice(FIRST), rng.choice(MIDDLE), rng.choice(LAST), rng.choice(SUFFIX)]
+    return ' '.join(part for part in parts if part)
+
+
+def page_chrome(rng, title):
+    style = ' '.join(f".css-{rng.randrange(16 ** 6):06x}{{margin:{rng.randint(0, 24)}px;display:flex}}" for _ in range(300))
+    nav = ''.join(f'<a class="nav-link" href="/section/{i}">Section {i}</a>' for i in range(40))
+    links = ''.join(f'<a href="/about/{i}">About {i}</a>' for i in range(60))
+    return PAGE_HEAD.format(title=title, style=style, nav=nav), PAGE_FOOT.format(links=links)
+
+
+def legacy_scroll(rng, days=14, per_day=45):
+    """A legacy.com county listing scrolled back two weeks"""
+    head, foot = page_chrome(rng, 'Franklin County Obituaries | Legacy.com')
+    body = []
+    for offset in range(days):
+        day = date(2024, 10, 15) - timedelta(days=offset)
+        body.append(f'<section class="Box-sc-ucqo0b-0 kGqPpt"><p color="neutral50" class="Box-sc-ucqo0b-0 Text-sc-1rhr8p-0 '
+                    f'fMqXkH">{day:%B} {day.day}, {day.year}</p>')
+        for _ in range(rng.randint(per_day - 10, per_day + 10)):
+            name = person_name(rng)
+            slug = name.lower().replace(' ', '-').replace('"', '').replace('.', '')
+            born = rng.randint(1925, 1990)
+            body.append(
+                '<div class="Box-sc-ucqo0b-0 PersonCard__Wrapper-sc-1f3m2yc-0 bTzQxs">'
+                f'<a href="/us/obituaries/name/{slug}-obituary?id={rng.randint(10 ** 7, 10 ** 8)}">'
+                f'<img alt="{name}" src="https://cache.legacy.net/legacy/images/cobrands/{rng.randint(1, 999)}.jpg" loading="lazy">'
+                f'<p data-component="PersonCardFullName" class="Box-sc-ucqo0b-0 Text-sc-1rhr8p-0 hZvlGa">{name}</p></a>'
+                f'<p class="Box-sc-ucqo0b-0 Text-sc-1rhr8p-0 dates">{born} - 2024</p>'
+                f'<p class="Box-sc-ucqo0b-0 Text-sc-1rhr8p-0 location">{rng.choice(CITIES)}, OH</p>'
+                f'<p class="Box-sc-ucqo0b-0 Text-sc-1rhr8p-0 fh">{rng.choice(FUNERAL_HOMES)} Funeral Home</p>'
+                '<div class="Box-sc-ucqo0b-0 actions"><button data-component="SignGuestBook">Sign Guest Book</button>'
+                '<button data-component="SendFlowers">Send Flowers</button></div></div>'
+            )
+        body.append('</section>')
+    return head + '<main><!-- repeat -->' + ''.join(body) + '<!-- /repeat --></main>' + foot
+
+
+def dispatch_listing(rng, days=10, per_day=20):
+    """The dispatch.com obituary index after scrolling through ten days"""
+    head, foot = page_chrome(rng, 'Obituaries | The Columbus Dispatch')
+    body = []
+    for offset in range(days):
+        day = date(2024, 10, 15) - timedelta(days=offset)
+        body.append(f'<h2 class="MuiTypography-root MuiTypography-h2 css-1cbvm0s">{day:%B} {day.day}, {day.year}</h2>')
+        for _ in range(rng.randint(per_day - 5, per_day + 5)):
+            name = person_name(rng)
+            age = f'<span aria-label="age" class="MuiTypography-root css-1ehp0xx">Age {rng.randint(40, 101)}</span>' if rng.random() < 0.8 else ''
+            location = f'<span aria-label="location" class="MuiTypography-root css-1ehp0xx">{rng.choice(CITIES)}, OH</span>' if rng.random() < 0.9 else ''
+            body.append(
+                '<div class="MuiGrid-root MuiGrid-container css-1rwztak">'
+                f'<div class="MuiGrid-root MuiGrid-item css-1wxaqej"><img alt="{name}" src="/images/obit/{rng.randint(1, 99999)}.jpg"></div>'
+                '<div class="MuiGrid-root MuiGrid-item css-9cvrpw">'
+                f'<a href="/obituaries/{rng.randint(10 ** 7, 10 ** 8)}"><h2 class="obit-title">{name}</h2></a>'
+                f'<div class="MuiBox-root css-0">{age}{location}</div>'
+                f'<p class="MuiTypography-root css-snippet">{name.split()[0]} passed away peacefully surrounded by family.</p>'
+                '</div></div>'
+            )
+    return head + '<main><!-- repeat -->' + ''.join(body) + '<!-- /repeat --></main>' + foot
+
+
+def listing_state(rng, days=7, per_day=30):
+    """A legacy.com listing over HTTP, and the (date header, name, age, location) records in its state"""
+    head, foot = page_chrome(rng, 'Franklin County Obituaries | Legacy.com')
+    obituaries = []
+    expected = []
+    cards = []
+    for offset in range(days):
+        day = date(2024, 10, 15) - timedelta(days=offset)
+        header = f"{day:%B} {day.day}, {day.year}"
+        cards.append(f'<section class="Box-sc-ucqo0b-0 kGqPpt"><p color="neutral50" class="Box-sc-ucqo0b-0 '
+                     f'Text-sc-1rhr8p-0 fMqXkH">{header}</p>')
+        for _ in range(rng.randint(per_day - 5, per_day + 5)):
+            parts = [rng.choice(FIRST[:-2]), rng.choice(MIDDLE[:6]), rng.choice(LAST), rng.choice(SUFFIX)]
+            name = ' '.join(part for part in parts if part)
+            age = rng.randint(40, 101) if rng.random() < 0.8 else None
+            city = rng.choice(CITIES)
+            # The site mixes ISO timestamps and plain dates
+            published = f"{day.isoformat()}T{rng.randint(10, 23)}:{rng.randint(0, 59):02d}:00Z" if rng.random() < 0.5 else day.isoformat()
+            obituaries.append({
+                'id': rng.randint(10 ** 7, 10 ** 8),
+                'name': {'firstName': parts[0], 'middleName': parts[1] or None, 'lastName': parts[2],
+                         'suffix': parts[3] or None},
+                'publishedDate': published,
+                'age': age,
+                'location': {'city': {'fullName': city}, 'state': {'code': 'OH'}},
+                'funeralHome': {'name': f"{rng.choice(FUNERAL_HOMES)} Funeral Home"},
+            })
+            expected.append([header, name, str(age) if age is not None else None, f"{city}, OH"])
+            cards.append('<div class="Box-sc-ucqo0b-0 PersonCard__Wrapper-sc-1f3m2yc-0 bTzQxs">'
+                         f'<p data-component="PersonCardFullName" class="Box-sc-ucqo0b-0 Text-sc-1rhr8p-0 hZvlGa">{name}</p>'
+                         f'<p class="Box-sc-ucqo0b-0 Text-sc-1rhr8p-0 location">{city}, OH</p></div>')
+        cards.append('</section>')
+
+    # Named, dated objects outside the listing: other counties' trending obituaries and sponsors
+    trending = [{'fullName': f"{rng.choice(FIRST[:-2])} {rng.choice(LAST)}", 'publishedDate': '2024-10-14',
+                 'location': 'Cleveland, OH'} for _ in range(12)]
+    sponsors = [{'name': f"{home} Funeral Home", 'date': '2024-10-01'} for home in FUNERAL_HOMES]
+    next_data = {'props': {'pageProps': {
+        'obituaryList': {'obituaries': obituaries, 'totalCount': len(obituaries)},
+        'trendingObituaries': trending,
+        'sponsors': sponsors,
+    }}, 'page': '/us/obituaries/local/[state]/[county]', 'buildId': 'fixture'}
+    ld_json = {'@context': 'https://schema.org', '@type': 'WebPage', 'name': 'Franklin County Obituaries',
+               'datePublished': '2024-10-15'}
+    state = (f'<script type="application/ld+json">{json.dumps(ld_json)}</script>'
+             f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>')
+    html = head + '<main><!-- repeat -->' + ''.join(cards) + '<!-- /repeat --></main>' + state + foot
+    return html, expected
+
+
+def auditor_results(rng, rows=25):
+    """A CommonSearch owner search returning a full page of parcels"""
+    head, foot = page_chrome(rng, 'Franklin County Auditor - Search Results')
+    body = ['<form name="frmMain" method="post" action="./CommonSearch.aspx?mode=OWNER">',
+            '<input type="hidden" name="__VIEWSTATE" value="%s">' % ('x' * 4000),
+            '<table id="searchResults" class="SearchResults"><tr class="SearchResultsHeader">'
+            '<th>Parcel ID</th><th>Owner</th><th>Address</th><th>Land Use</th></tr><!-- repeat -->']
+    for index in range(rows):
+        owner = person_name(rng).upper()
+        body.append(
+            f'<tr class="SearchResults" onclick="javascript:selectSearchRow(\'../Datalets/Datalet.aspx?sIndex=0&idx={index + 1}\')">'
+            f'<td>{rng.randint(10, 610):03d}-{rng.randint(0, 999999):06d}-00</td><td>{owner}</td>'
+            f'<td>{rng.randint(10, 9999)} {rng.choice(LAST).upper()} RD</td><td>510 - ONE-FAMILY DWELLING</td></tr>'
+        )
+    body.append('<!-- /repeat --></table></form>')
+    return head + ''.join(body) + foot
+
+
+def auditor_datalet(rng, sections=8, rows_per_section=15):
+    """A parcel datalet: the owner table the parser reads plus the tax, sales and building tables around it"""
+    head, foot = page_chrome(rng, 'Franklin County Auditor - Parcel')
+    town = rng.choice(CITIES).upper()
+    zip_code = rng.randint(43000, 43299)
+    owner_rows = [
+        ('Owner', 'SMITH JOHN A'),
+        ('Owner Mailing /<br>Contact Address', f'SMITH JOHN A<br>1234 MAPLE AVE<br>{town} OH {zip_code}'),
+        ('Site (Property) Address', '1234 MAPLE AVE'),
+        ('City/Village', f'{town} OH'),
+        ('Zip Code', str(zip_code)),
+    ]
+    tables = ['<table class="DataletTable" id="Owner">' + ''.join(
+        f'<tr><td class="DataletSideHeading">{heading}</td><td class="DataletData">{data}</td></tr>'
+        for heading, data in owner_rows) + '</table><!-- repeat -->']
+    for section in range(sections):
+        rows = ''.join(
+            f'<tr><td class="DataletSideHeading">Field {section}.{row}</td>'
+            f'<td class="DataletData">{rng.randint(0, 10 ** 6):,}</td></tr>'
+            for row in range(rows_per_section))
+        tables.append(f'<table class="DataletTable" id="Section{section}"><tr><td class="DataletTopHeading" colspan="2">'
+                      f'Section {section}</td></tr>{rows}</table>')
+    tables.append('<!-- /repeat -->')
+    return head + '<div id="datalet">' + ''.join(tables) + '</div>' + foot
+
+
+FIXTURES = {
+    'legacy_scroll.html': legacy_scroll,
+    'dispatch_listing.html': dispatch_listing,
+    'auditor_results.html': auditor_results,
+    'auditor_datalet.html': auditor_datalet,
+}
+
+
+def main():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for filename, build in FIXTURES.items():
+        html = build(random.Random(filename))
+        with open(os.path.join(FIXTURE_DIR, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+        print(f"{filename}: {len(html) / 1024:.0f} KiB")
+
+    html, expected = listing_state(random.Random('listing_state.html'))
+    with open(os.path.join(FIXTURE_DIR, 'listing_state.html'), 'w', encoding='utf-8') as f:
+        f.write(html)
+    with open(os.path.join(FIXTURE_DIR, 'listing_state_expected.json'), 'w', encoding='utf-8') as f:
+        json.dump(expected, f, indent=1)
+        f.write('\n')
+    print(f"listing_state.html: {len(html) / 1024:.0f} KiB, {len(expected)} records")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Offline parser benchmarks over the recorded pages in benchmarks/fixtures, reported as JSON
+
+Every case runs at the fixture's realistic size and at 10x. The JSON report carries the
+code version and library versions, so reports from two versions can be compared:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    ... change code ...
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+
+Usage: python benchmarks/run_benchmarks.py [--repeat N] [--scales 1,10] [--output FILE]
+                                           [--compare FILE] [--threshold 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import bs4
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+from address_parsing import split_addresses
+from auditor_client import parse_datalet, parse_search_results
+from listing_parsers import parse_dispatch_cards, parse_legacy_cards
+from name_parsing import split_name, split_names
+from page_state import parse_listing_state
+from sources import LegacyAdapter
+
+from bench_address_split import make_frame
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+REPEAT_START = '<!-- repeat -->'
+REPEAT_END = '<!-- /repeat -->'
+
+
+def load_fixture(filename, scale=1):
+    """A fixture page with its repeat block duplicated `scale` times"""
+    with open(os.path.join(FIXTURE_DIR, filename), encoding='utf-8') as f:
+        html = f.read()
+    head, rest = html.split(REPEAT_START, 1)
+    block, tail = rest.split(REPEAT_END, 1)
+    return head + block * scale + tail
+
+
+def measure(func, arg, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func(arg)
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def build_cases(scale):
+    """(name, function, argument, item count, setup) for every benchmark at one scale"""
+    legacy_html = load_fixture('legacy_scroll.html', scale)
+    dispatch_html = load_fixture('dispatch_listing.html', scale)
+    results_html = load_fixture('auditor_results.html', scale)
+    datalet_html = load_fixture('auditor_datalet.html', scale)
+    # The rendered cards repeat, the embedded state does not: the page weight grows around the same records
+    state_html = load_fixture('listing_state.html', scale)
+
+    legacy_cards = parse_legacy_cards(legacy_html)
+    dispatch_cards = parse_dispatch_cards(dispatch_html)
+    names = [name for _, name in legacy_cards] + [card[1] for card in dispatch_cards]
+    addresses = make_frame(len(names))
+
+    def parse_each(values):
+        parse = split_name.__wrapped__
+        return [parse(value) for value in values]
+
+    return [
+        ('legacy_cards', parse_legacy_cards, legacy_html, len(legacy_cards), None),
+        ('dispatch_cards', parse_dispatch_cards, dispatch_html, len(dispatch_cards), None),
+        ('listing_state', lambda html: parse_listing_state(html, LegacyAdapter.state_paths), state_html,
+         len(parse_listing_state(state_html, LegacyAdapter.state_paths)), None),
+        ('auditor_results', lambda html: parse_search_results(html, 'https://auditor.invalid/_web/search/'),
+         results_html, results_html.count('class="SearchResults" onclick'), None),
+        ('auditor_datalet', parse_datalet, datalet_html, 1, None),
+        # split_name without its memo, so the 10x pages' repeated names are parsed every time
+        ('split_name', parse_each, names, len(names), None),
+        ('split_names', split_names, names, len(names), split_name.cache_clear),
+        ('split_addresses', split_addresses, addresses, len(addresses), None),
+    ]
+
+
+def code_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales, repeat):
+    results = []
+    for scale in scales:
+        for name, func, arg, items, setup in build_cases(scale):
+            timings, _ = measure(func, arg, repeat, setup)
+            best = min(timings)
+            results.append({
+                'benchmark': name,
+                'scale': scale,
+                'items': items,
+                'input_bytes': len(arg.encode('utf-8')) if isinstance(arg, str) else None,
+                'repeat': repeat,
+                'best_seconds': round(best, 6),
+                'median_seconds': round(statistics.median(timings), 6),
+                'per_item_us': round(best / max(items, 1) * 1e6, 3),
+            })
+            print(f"{name:16} x{scale:<3} {items:7} items  best {best * 1000:9.2f} ms  "
+                  f"{results[-1]['per_item_us']:9.2f} us/item", file=sys.stderr)
+    return {
+        'version': code_version(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'libraries': {'pandas': pd.__version__, 'beautifulsoup4': bs4.__version__},
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Print the change in best time per case against a baseline report; return the regressions"""
+    previous = {(entry['benchmark'], entry['scale']): entry for entry in baseline['results']}
+    regressions = []
+    print(f"\nAgainst {baseline.get('version')} ({baseline.get('created')}):", file=sys.stderr)
+    for entry in report['results']:
+        before = previous.get((entry['benchmark'], entry['scale']))
+        if not before or not before['best_seconds']:
+            continue
+        change = entry['best_seconds'] / before['best_seconds'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(entry['benchmark'])
+        print(f"{entry['benchmark']:16} x{entry['scale']:<3} {change:+7.1%}{flag}", file=sys.stderr)
+        entry['change'] = round(change, 4)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the listing, auditor, name and address parsers offline")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scales', default='1,10', help="Comma-separated fixture multipliers")
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    parser.add_argument('--compare', help="Baseline JSON report; exit 1 if any case got slower than --threshold")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    report = run([int(scale) for scale in args.scales.split(',')], args.repeat)
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
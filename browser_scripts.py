@@ -0,0 +1,64 @@
+"""JavaScript snippets run inside the listing pages via execute_script"""
+
+# Returns a JSON array of [date header, full name] pairs for cards not returned by an
+# earlier call. Processed elements are tagged with data-obit-seen, and the last date
+# header is kept on window so cards rendered later still get the right date.
+LEGACY_EXTRACT_SCRIPT = """
+var state = window.__obitExtract || (window.__obitExtract = {date: null});
+var nodes = document.querySelectorAll(
+    'p[color="neutral50"].Box-sc-ucqo0b-0:not([data-obit-seen]),' +
+    'h4[color="neutral50"].Box-sc-ucqo0b-0:not([data-obit-seen]),' +
+    'p[data-component="PersonCardFullName"]:not([data-obit-seen]),' +
+    'h4[data-component="PersonCardFullName"]:not([data-obit-seen])'
+);
+var out = [];
+for (var i = 0; i < nodes.length; i++) {
+    var el = nodes[i];
+    var text = (el.textContent || '').trim();
+    if (el.getAttribute('color') === 'neutral50' && el.classList.contains('Box-sc-ucqo0b-0')) {
+        state.date = text;
+    } else if (!text) {
+        continue;  // not hydrated yet, pick it up on the next call
+    } else if (state.date) {
+        out.push([state.date, text]);
+    }
+    el.setAttribute('data-obit-seen', '1');
+}
+return JSON.stringify(out);
+"""
+
+# Returns a JSON array of [date header, name, age, location] for every rendered
+# dispatch.com card in one round trip. Cards take the nearest date header above them,
+# and a missing age or location comes back as null.
+DISPATCH_EXTRACT_SCRIPT = """
+var headerSelector = 'h2.MuiTypography-root.MuiTypography-h2.css-1cbvm0s';
+var cardSelector = 'div.MuiGrid-root.MuiGrid-container.css-1rwztak';
+var text = function (el) { return el ? (el.innerText || el.textContent || '').trim() : null; };
+var firstHeader = document.querySelector(headerSelector);
+var date = firstHeader ? text(firstHeader) : null;
+var nodes = document.querySelectorAll(headerSelector + ',' + cardSelector);
+var out = [];
+for (var i = 0; i < nodes.length; i++) {
+    var el = nodes[i];
+    if (el.matches(headerSelector)) {
+        date = text(el);
+        continue;
+    }
+    var name = text(el.querySelector('h2.obit-title'));
+    if (!name) {
+        continue;
+    }
+    var age = text(el.querySelector('[aria-label="age"]'));
+    out.push([
+        date,
+        name,
+        age ? age.replace('Age ', '').trim() : null,
+        text(el.querySelector('[aria-label="location"]')) || null
+    ]);
+}
+return JSON.stringify(out);
+"""
+
+# Selectors the readiness waits use to tell that listing cards have rendered
+LEGACY_CARD_SELECTOR = '[data-component="PersonCardFullName"]'
+DISPATCH_CARD_SELECTOR = 'div.MuiGrid-root.MuiGrid-container.css-1rwztak'
@@ -0,0 +1,102 @@
+"""Score auditor search-result rows against the obituary so only the likeliest owner's datalet is opened
+
+Owner cells read like 'SMITH JOHN A JR', 'SMITH JOHN A & MARY B' or 'SMITH JOHN A TR'.
+A row must carry the last name to score at all. The first name, middle initial, suffix
+and the obituary's town then add to or take from the score. Businesses and public
+bodies are never a match.
+"""
+import os
+import re
+
+from name_parsing import NICKNAME_PATTERN
+
+MATCH_THRESHOLD = 0.6
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+QUOTED_PATTERN = re.compile(r'["“”][^"“”]*["“”]')
+GENERATION_SUFFIXES = frozenset(['jr', 'sr', 'ii', 'iii', 'iv'])
+TRUST_WORDS = frozenset(['tr', 'trs', 'trust', 'trustee', 'trustees', 'est', 'estate', 'life'])
+ENTITY_WORDS = frozenset(['llc', 'inc', 'corp', 'co', 'company', 'ltd', 'lp', 'llp', 'partnership', 'properties',
+                          'holdings', 'investments', 'church', 'bank', 'association', 'assn', 'city', 'county',
+                          'state', 'board', 'authority', 'village', 'township', 'school', 'district'])
+NO_LOCATION = frozenset(['', 'n/a', 'ohio', 'oh'])
+
+
+def name_words(text):
+    """Lowercase name words; apostrophes and periods vanish, hyphens split ("O'Neil" -> oneil)"""
+    return WORD_PATTERN.findall((text or '').lower().replace("'", '').replace('.', ''))
+
+
+class Person:
+    """What is known about the person being looked up, normalized for scoring"""
+
+    def __init__(self, first_name, last_name, full_name=None, location=None):
+        self.first = name_words(first_name)[:1]
+        self.last = name_words(last_name)
+        words = name_words(QUOTED_PATTERN.sub(' ', NICKNAME_PATTERN.sub(' ', full_name or '')))
+        self.suffix = words[-1] if words and words[-1] in GENERATION_SUFFIXES else None
+        self.middle_initial = None
+        if self.first and self.first[0] in words:
+            after = words[words.index(self.first[0]) + 1:]
+            if after and after[0] not in self.last and after[0] not in GENERATION_SUFFIXES:
+                self.middle_initial = after[0][0]
+        town = (location or '').split(',')[0].strip().lower()
+        self.town = name_words(town) if town not in NO_LOCATION else []
+
+
+def score_candidate(candidate, person):
+    """Score one results row between 0 and 1; rows without the last name score 0"""
+    owner = name_words(candidate.get('owner'))
+    if not owner or not person.last or ENTITY_WORDS.intersection(owner):
+        return 0.0
+    if not all(word in owner for word in person.last):
+        return 0.0
+
+    score = 0.3
+    if owner[:len(person.last)] == person.last:
+        # Listed surname-first as the primary owner
+        score += 0.1
+        given = owner[len(person.last):]
+    else:
+        given = [word for word in owner if word not in person.last]
+
+    first = person.first[0] if person.first else None
+    if first and first in given:
+        score += 0.35 if given[0] == first else 0.25
+        after = given[given.index(first) + 1:]
+        following = after[0] if after else None
+        if person.middle_initial and following and following not in GENERATION_SUFFIXES | TRUST_WORDS:
+            score += 0.1 if following[0] == person.middle_initial else -0.15
+    elif first and any(len(word) == 1 and word == first[0] for word in given):
+        # Only an initial on record
+        score += 0.1
+
+    owner_suffix = next((word for word in given if word in GENERATION_SUFFIXES), None)
+    if person.suffix and owner_suffix:
+        score += 0.1 if owner_suffix == person.suffix else -0.3
+    elif owner_suffix:
+        # Probably the father or son of the person in the obituary
+        score -= 0.1
+    if TRUST_WORDS.intersection(given):
+        score -= 0.05
+
+    if person.town:
+        place = name_words(f"{candidate.get('address') or ''} {candidate.get('city') or ''}")
+        if all(word in place for word in person.town):
+            score += 0.1
+    return round(max(0.0, min(score, 1.0)), 3)
+
+
+def rank_candidates(candidates, person):
+    """(score, candidate) pairs, best first; ties keep page order"""
+    scored = [(score_candidate(candidate, person), candidate) for candidate in candidates]
+    return sorted(scored, key=lambda pair: -pair[0])
+
+
+def best_candidate(candidates, person, threshold=None):
+    """The best-scoring row if it clears the threshold ($AUDITOR_MATCH_THRESHOLD), else None"""
+    if threshold is None:
+        threshold = float(os.getenv('AUDITOR_MATCH_THRESHOLD', MATCH_THRESHOLD))
+    ranked = rank_candidates(candidates, person)
+    if ranked and ranked[0][0] >= threshold:
+        return ranked[0][1]
+    return None
@@ -0,0 +1,119 @@
+"""Durable run checkpoint: the scraped obituary set and every finished property lookup"""
+import json
+import os
+import threading
+
+from config import get_state_dir
+from property_cache import cache_key
+
+
+class RunCheckpoint:
+    """Append-only JSON-lines journal of one run, fsynced after every entry
+
+    The first entry holds the scraped obituary rows, each later entry one completed
+    search_property result or one failed search. A failed search is never a result:
+    it is only noted, so a resumed run looks that name up again. A torn last line
+    from a crash is ignored on load.
+    """
+
+    def __init__(self, path=None, state_dir=None):
+        self.path = path or os.getenv('CHECKPOINT_PATH') or os.path.join(state_dir or get_state_dir(), 'run_checkpoint.jsonl')
+        self.lock = threading.Lock()
+        self.rows = None
+        self.results = {}
+        # Keys whose last search failed; resume retries them
+        self.failed = set()
+        self.file = None
+
+    def load(self):
+        """Read an existing journal; return True if it holds a scraped obituary set to resume from"""
+        self.rows = None
+        self.results = {}
+        self.failed = set()
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('type') == 'obituaries':
+                    self.rows = entry['rows']
+                elif entry.get('type') == 'lookup':
+                    self.results[entry['key']] = tuple(entry['result'])
+                    self.failed.discard(entry['key'])
+                elif entry.get('type') == 'failed' and entry['key'] not in self.results:
+                    self.failed.add(entry['key'])
+        return self.rows is not None
+
+    def start(self, rows):
+        """Begin a fresh journal with the scraped obituary rows
+
+        Lookups loaded from an unfinished journal are written into the new one, so
+        replacing it never throws away finished work.
+        """
+        self.rows = None
+        with self.lock:
+            self._close_file()
+            tmp_path = self.path + '.tmp'
+            self.file = open(tmp_path, 'w', encoding='utf-8')
+            self._append({'type': 'obituaries', 'rows': list(rows)})
+            for key, result in self.results.items():
+                self._append({'type': 'lookup', 'key': key, 'result': list(result)})
+            for key in self.failed:
+                self._append({'type': 'failed', 'key': key})
+            # The old journal is only replaced once the new one holds everything it did
+            os.replace(tmp_path, self.path)
+
+    def resume(self):
+        """Keep appending to the loaded journal"""
+        self.rows = None
+        with self.lock:
+            self._close_file()
+            self.file = open(self.path, 'a', encoding='utf-8')
+
+    def get(self, first_name, last_name, hints=None):
+        """The result a previous attempt already finished for this name, or None"""
+        return self.results.get(cache_key(first_name, last_name, hints))
+
+    def record(self, first_name, last_name, result, hints=None):
+        """Journal a finished lookup; only searches that reached the auditor belong here"""
+        key = cache_key(first_name, last_name, hints)
+        with self.lock:
+            self.results[key] = tuple(result)
+            self.failed.discard(key)
+            if self.file:
+                self._append({'type': 'lookup', 'key': key, 'result': list(result)})
+
+    def record_failure(self, first_name, last_name, hints=None):
+        """Note a search that failed without marking the name done"""
+        key = cache_key(first_name, last_name, hints)
+        with self.lock:
+            if key in self.results:
+                return
+            self.failed.add(key)
+            if self.file:
+                self._append({'type': 'failed', 'key': key})
+
+    def _append(self, entry):
+        self.file.write(json.dumps(entry) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _close_file(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def close(self):
+        with self.lock:
+            self._close_file()
+
+    def clear(self):
+        """Drop the journal once the run has finished"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -13,3 +13,9 @@ def get_google_credentials():
     except Exception as e:
         print(f"Error parsing Google credentials: {e}")
         return None
+
+def get_state_dir():
+    """Directory for caches and other state that should survive between runs"""
+    state_dir = os.getenv('SCRAPER_STATE_DIR', os.path.expanduser('~/obituary_scraper_state'))
+    os.makedirs(state_dir, exist_ok=True)
+    return state_dir
@@ -0,0 +1,88 @@
+"""Counties the scraper covers, loaded from counties.json: listing URLs, auditor adapter and Drive folder
+
+Each entry in counties.json looks like
+
+    "delaware": {
+        "name": "Delaware County",
+        "sources": {"legacy": "https://www.legacy.com/us/obituaries/local/ohio/delaware-county"},
+        "auditor": {"adapter": "commonsearch", "base_url": "https://auditor.example.gov"},
+        "drive_folder_id": "...",
+        "output_prefix": "obituaries_with_property_delaware",
+        "state_subdir": "delaware"
+    }
+
+`sources` keys are listing adapters from sources.py. `output_prefix` and `state_subdir`
+default to the county key, so counties never share output files, caches or high-water
+marks; an empty `state_subdir` keeps the state in the top-level state directory.
+"""
+import json
+import os
+
+from config import get_state_dir
+
+COUNTIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'counties.json')
+DEFAULT_COUNTY = 'franklin'
+# Auditor site software the lookup engines can drive; both speak iasWorld CommonSearch
+AUDITOR_ADAPTERS = ['commonsearch']
+
+
+class County:
+    """One county's configuration"""
+
+    def __init__(self, key, name, sources, auditor_url, folder_id, auditor_adapter='commonsearch',
+                 output_prefix=None, state_subdir=None):
+        if auditor_adapter not in AUDITOR_ADAPTERS:
+            raise ValueError(f"County {key}: unsupported auditor adapter {auditor_adapter!r}")
+        if not sources:
+            raise ValueError(f"County {key}: no listing sources configured")
+        self.key = key
+        self.name = name or key
+        self.sources = dict(sources)
+        self.auditor_url = auditor_url.rstrip('/')
+        self.auditor_adapter = auditor_adapter
+        self.folder_id = folder_id
+        self.output_prefix = output_prefix or f"obituaries_with_property_{key}"
+        self.state_subdir = key if state_subdir is None else state_subdir
+
+    @classmethod
+    def from_config(cls, key, entry):
+        auditor = entry.get('auditor') or {}
+        return cls(
+            key,
+            entry.get('name'),
+            entry.get('sources'),
+            auditor.get('base_url', ''),
+            entry.get('drive_folder_id'),
+            auditor_adapter=auditor.get('adapter', 'commonsearch'),
+            output_prefix=entry.get('output_prefix'),
+            state_subdir=entry.get('state_subdir'),
+        )
+
+    @property
+    def state_dir(self):
+        """Where this county keeps its caches, checkpoint and high-water marks"""
+        if not self.state_subdir:
+            return get_state_dir()
+        state_dir = os.path.join(get_state_dir(), self.state_subdir)
+        os.makedirs(state_dir, exist_ok=True)
+        return state_dir
+
+    def output_filename(self, current_date):
+        return f"{self.output_prefix}_{current_date}.csv"
+
+
+def load_counties(path=None):
+    """All configured counties by key, in file order"""
+    path = path or os.getenv('COUNTIES_PATH') or COUNTIES_PATH
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    return {key: County.from_config(key, entry) for key, entry in config.items()}
+
+
+def get_county(key=None, path=None):
+    """The configured county `key`, defaulting to $COUNTY or Franklin"""
+    key = (key or os.getenv('COUNTY') or DEFAULT_COUNTY).lower()
+    counties = load_counties(path)
+    if key not in counties:
+        raise ValueError(f"Unknown county {key!r}; configured: {', '.join(counties)}")
+    return counties[key]
@@ -0,0 +1,112 @@
+"""Run many counties at once: one worker process per county, at most max_parallel at a time
+
+Each county is a full scraper run (listings, lookups, output file and Drive upload) in its
+own process, so counties spread across cores instead of queueing behind one serial run.
+A county's output goes to its own log file; the runner prints a combined summary.
+"""
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from counties import load_counties
+
+
+def default_max_parallel():
+    """$MAX_PARALLEL_COUNTIES, or one county per core"""
+    return int(os.getenv('MAX_PARALLEL_COUNTIES') or os.cpu_count() or 1)
+
+
+def run_county(key, options, log_dir=None):
+    """Worker process entry point: run one county and return its summary"""
+    # Imported here so the parent process never loads Selenium or Chrome
+    from IntegratedObituaryPropertyScraper import IntegratedObituaryPropertyScraper
+
+    log_path = log_file = None
+    streams = sys.stdout, sys.stderr
+    if log_dir:
+        log_path = os.path.join(log_dir, f"county_{key}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+        log_file = open(log_path, 'w', buffering=1, encoding='utf-8')
+        sys.stdout = sys.stderr = log_file
+
+    started = time.time()
+    try:
+        scraper = IntegratedObituaryPropertyScraper(county=key, **options)
+        summary = scraper.run() or {'county': key}
+        summary['status'] = 'ok'
+        summary['metrics'] = scraper.metrics_paths
+    except BaseException as e:
+        traceback.print_exc()
+        summary = {'county': key, 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+    finally:
+        # Pool processes are reused for the next county
+        sys.stdout, sys.stderr = streams
+        if log_file:
+            log_file.close()
+    summary['seconds'] = round(time.time() - started, 1)
+    summary['log'] = log_path
+    return summary
+
+
+def run_counties(keys=None, max_parallel=None, log_dir=None, **options):
+    """Run the given counties (default: all configured) in parallel; return their summaries in order"""
+    counties = load_counties()
+    keys = [key.lower() for key in keys] if keys else list(counties)
+    unknown = [key for key in keys if key not in counties]
+    if unknown:
+        raise ValueError(f"Unknown counties: {', '.join(unknown)}; configured: {', '.join(counties)}")
+
+    max_parallel = max(1, int(max_parallel or default_max_parallel()))
+    if log_dir is None:
+        log_dir = os.getenv('COUNTY_LOG_DIR', os.path.expanduser('~/obituary_scraper_logs'))
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    print(f"Running {len(keys)} counties, {min(max_parallel, len(keys))} at a time")
+    summaries = {}
+    # spawn, not fork: the parent may hold threads and Chrome must start from a clean process
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(max_parallel, len(keys)), mp_context=context) as executor:
+        futures = {executor.submit(run_county, key, options, log_dir): key for key in keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                # The worker process itself died (killed, out of memory)
+                summary = {'county': key, 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+            summaries[key] = summary
+            print(f"{counties[key].name}: {summary['status']}"
+                  + (f", {summary.get('records', 0)} records in {summary.get('seconds', 0)}s"
+                     if summary['status'] == 'ok' else f" ({summary.get('error')})"))
+
+    ordered = [summaries[key] for key in keys]
+    print_combined_summary(ordered, counties)
+    return ordered
+
+
+def print_combined_summary(summaries, counties):
+    by_source = Counter()
+    records = with_property = 0
+    print("\nCounty summary:")
+    for summary in summaries:
+        name = counties[summary['county']].name
+        if summary['status'] != 'ok':
+            print(f"{name}: FAILED ({summary.get('error')})" + (f", log {summary['log']}" if summary.get('log') else ''))
+            continue
+        records += summary.get('records', 0)
+        with_property += summary.get('with_property', 0)
+        by_source.update(summary.get('by_source', {}))
+        upload = 'uploaded' if summary.get('uploaded') else 'NOT uploaded'
+        print(f"{name}: {summary.get('records', 0)} records, {summary.get('with_property', 0)} with property, "
+              f"{upload}, {summary.get('seconds', 0)}s")
+
+    failed = sum(summary['status'] != 'ok' for summary in summaries)
+    print(f"\nCounties: {len(summaries) - failed} succeeded, {failed} failed")
+    print(f"Records: {records} ({with_property} with property information)")
+    for source, count in by_source.most_common():
+        print(f"{source}: {count}")
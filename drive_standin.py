@@ -0,0 +1,209 @@
+"""Local stand-in for the Drive v3 resumable upload API, for testing DriveUploader without Google
+
+Serves the flow files().create walks with a resumable media body: the POST to
+/upload/drive/v3/files?uploadType=resumable that opens a session and answers with its
+Location, chunk PUTs with Content-Range answered 308 with the received Range until the
+last one returns the file's id, and the empty 'bytes */N' PUT the client sends to ask
+where to resume after a failure. A fraction of upload requests can fail with a 5xx
+before anything is stored. Uploaded files are kept in memory for inspection.
+
+Usage: python drive_standin.py [--port 8766] [--error-rate 0.1]
+       DRIVE_API_ENDPOINT=http://127.0.0.1:8766 python run_scraper.py
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+UPLOAD_PAGE = '/upload/drive/v3/files'
+SESSION_PAGE = '/_standin/session/'
+STATS_PAGE = '/_standin/stats'
+CONTENT_RANGE = re.compile(r'bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)')
+
+
+class DriveFile:
+    """One upload: its metadata, the bytes received so far and the id once complete"""
+
+    def __init__(self, name, parents, mimetype):
+        self.name = name
+        self.parents = parents
+        self.mimetype = mimetype
+        self.data = bytearray()
+        self.id = None
+
+
+class DriveStandIn:
+    """Threaded HTTP server accepting resumable Drive uploads into memory"""
+
+    def __init__(self, host='127.0.0.1', port=0, error_rate=0.0, error_status=503, seed=None):
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.files = {}
+        self.stats = {'requests': 0, 'sessions': 0, 'chunks': 0, 'status_queries': 0, 'completed': 0, 'errors': 0}
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def fails(self):
+        if not self.error_rate:
+            return False
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def by_name(self):
+        """Completed uploads keyed by file name"""
+        with self.lock:
+            return {drive_file.name: drive_file for drive_file in self.files.values()}
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def send_body(self, status, body=b'', headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if body:
+                    self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_json(self, status, payload, headers=None):
+                self.send_body(status, json.dumps(payload).encode('utf-8'), headers)
+
+            def read_body(self):
+                return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+            def gate(self):
+                """Count the request; answer an injected server error and return False when it fails"""
+                standin.count('requests')
+                if standin.fails():
+                    standin.count('errors')
+                    self.send_json(standin.error_status, {'error': {'code': standin.error_status,
+                                                                    'message': 'Stand-in backend error'}})
+                    return False
+                return True
+
+            def do_GET(self):
+                if urlsplit(self.path).path == STATS_PAGE:
+                    files = [{'id': f.id, 'name': f.name, 'parents': f.parents, 'size': len(f.data)}
+                             for f in standin.by_name().values()]
+                    return self.send_json(200, dict(standin.snapshot(), files=files))
+                self.send_json(404, {'error': {'code': 404, 'message': 'Not Found'}})
+
+            def do_POST(self):
+                parts = urlsplit(self.path)
+                body = self.read_body()
+                query = parse_qs(parts.query)
+                if parts.path != UPLOAD_PAGE or query.get('uploadType') != ['resumable']:
+                    return self.send_json(404, {'error': {'code': 404, 'message': 'Not Found'}})
+                if not self.gate():
+                    return
+                metadata = json.loads(body or b'{}')
+                drive_file = DriveFile(metadata.get('name'), metadata.get('parents', []),
+                                       self.headers.get('X-Upload-Content-Type'))
+                session = uuid.uuid4().hex
+                with standin.lock:
+                    standin.sessions[session] = drive_file
+                standin.count('sessions')
+                host = self.headers.get('Host') or '{}:{}'.format(*standin.server.server_address[:2])
+                self.send_body(200, headers={'Location': f"http://{host}{SESSION_PAGE}{session}"})
+
+            def do_PUT(self):
+                path = urlsplit(self.path).path
+                data = self.read_body()
+                with standin.lock:
+                    drive_file = standin.sessions.get(path[len(SESSION_PAGE):]) if path.startswith(SESSION_PAGE) else None
+                if drive_file is None:
+                    return self.send_json(404, {'error': {'code': 404, 'message': 'Upload session not found'}})
+                if not self.gate():
+                    return
+
+                match = CONTENT_RANGE.fullmatch(self.headers.get('Content-Range') or 'bytes */0')
+                if not match:
+                    return self.send_json(400, {'error': {'code': 400, 'message': 'Bad Content-Range'}})
+                start, total = match.group(1), match.group(3)
+                with standin.lock:
+                    if start is None:
+                        standin.stats['status_queries'] += 1
+                    elif int(start) != len(drive_file.data):
+                        # Only the next byte is accepted; the client re-sends from the Range it was given
+                        return self.send_json(400, {'error': {'code': 400, 'message': 'Chunk out of order'}})
+                    else:
+                        standin.stats['chunks'] += 1
+                        drive_file.data.extend(data)
+                    received = len(drive_file.data)
+                    complete = drive_file.id is not None or (total != '*' and received == int(total))
+                    if complete and drive_file.id is None:
+                        drive_file.id = uuid.uuid4().hex[:28]
+                        standin.files[drive_file.id] = drive_file
+                        standin.stats['completed'] += 1
+                if complete:
+                    return self.send_json(200, {'id': drive_file.id})
+                headers = {'Range': f"bytes=0-{received - 1}"} if received else {}
+                self.send_body(308, headers=headers)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for Drive v3 resumable uploads")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of upload requests answered with a 503")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    standin = DriveStandIn(args.host, args.port, error_rate=args.error_rate, seed=args.seed)
+    print(f"Drive stand-in listening on {standin.url} (stats and uploaded files at {standin.url}{STATS_PAGE})")
+    try:
+        standin.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Google Drive uploads from memory: cached service, resumable chunked transfer with retries, optional gzip"""
+import ast
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import google_auth_httplib2
+import httplib2
+import pandas as pd
+from google.auth.credentials import AnonymousCredentials
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload, build_http
+
+DRIVE_SCOPES = ['https://www.googleapis.com/auth/drive.file']
+# Resumable chunks must be a multiple of 256 KiB
+CHUNK_SIZE = 4 * 1024 * 1024
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+MIMETYPES = {'.csv': 'text/csv', '.parquet': 'application/vnd.apache.parquet'}
+MAX_BACKOFF = 32
+
+
+def is_retryable(error):
+    """Transient upload failures: throttling, server errors and dropped or timed-out connections"""
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUS
+    return isinstance(error, (OSError, httplib2.HttpLib2Error))
+
+
+def parse_credentials(raw):
+    """Service-account info from GOOGLE_CREDENTIALS_JSON: JSON, a JSON-quoted JSON string or a dict literal"""
+    try:
+        info = json.loads(raw)
+    except ValueError:
+        info = ast.literal_eval(raw)
+    if isinstance(info, str):
+        return parse_credentials(info)
+    return info
+
+
+class DriveUploader:
+    """Upload DataFrames and files into one Drive folder, reusing a single authenticated client
+
+    DRIVE_API_ENDPOINT points the client at another host, e.g. drive_standin.py, a local
+    fake of the Drive API; without credentials it then connects anonymously.
+    """
+
+    def __init__(self, folder_id, credentials_info=None, api_endpoint=None, chunk_size=None,
+                 num_retries=None, compress=None, backoff=1.0):
+        self.folder_id = folder_id
+        self.api_endpoint = api_endpoint or os.getenv('DRIVE_API_ENDPOINT')
+        self.chunk_size = int(chunk_size or os.getenv('DRIVE_CHUNK_SIZE', CHUNK_SIZE))
+        self.num_retries = int(num_retries if num_retries is not None else os.getenv('DRIVE_UPLOAD_RETRIES', 5))
+        self.compress = compress if compress is not None else os.getenv('DRIVE_GZIP', '') == '1'
+        self.backoff = backoff
+        self._credentials_info = credentials_info
+        self._credentials = None
+        self._service = None
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        # Chunk uploads retried after a transient failure, across every upload
+        self.retries = 0
+
+    def credentials(self):
+        with self._lock:
+            if self._credentials is None:
+                info = self._credentials_info
+                if info is None and os.getenv('GOOGLE_CREDENTIALS_JSON'):
+                    info = parse_credentials(os.getenv('GOOGLE_CREDENTIALS_JSON'))
+                if info is not None:
+                    self._credentials = service_account.Credentials.from_service_account_info(info, scopes=DRIVE_SCOPES)
+                elif self.api_endpoint:
+                    self._credentials = AnonymousCredentials()
+                else:
+                    raise RuntimeError("GOOGLE_CREDENTIALS_JSON is not set")
+            return self._credentials
+
+    @property
+    def service(self):
+        """The Drive v3 client, built once from the bundled discovery document"""
+        with self._lock:
+            if self._service is None:
+                client_options = {'api_endpoint': self.api_endpoint} if self.api_endpoint else None
+                self._service = build('drive', 'v3', credentials=self.credentials(),
+                                      client_options=client_options, cache_discovery=False)
+            return self._service
+
+    def _http(self):
+        # httplib2 connections are not thread-safe, so each upload thread gets its own.
+        # build_http also stops httplib2 treating the resumable protocol's 308 as a redirect.
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = google_auth_httplib2.AuthorizedHttp(self.credentials(), http=build_http())
+        return http
+
+    def upload_stream(self, stream, filename, mimetype='text/csv'):
+        """Resumable chunked upload of a binary stream; return the new file's id"""
+        media = MediaIoBaseUpload(stream, mimetype=mimetype, chunksize=self.chunk_size, resumable=True)
+        request = self.service.files().create(
+            body={'name': filename, 'parents': [self.folder_id]},
+            media_body=media,
+            fields='id'
+        )
+        if self.api_endpoint and self.api_endpoint.startswith('http://'):
+            # The client keeps https for media URLs even when the endpoint is a plain-http fake
+            request.uri = request.uri.replace('https://', 'http://', 1)
+        http = self._http()
+        response = None
+        failures = 0
+        while response is None:
+            try:
+                _, response = request.next_chunk(http=http)
+                failures = 0
+            except Exception as e:
+                # next_chunk's own num_retries re-sends an already consumed stream slice, so
+                # retries happen here: the failed chunk is re-read from the last acknowledged
+                # byte, and after a dropped connection the client asks the server where to resume
+                if failures >= self.num_retries or not is_retryable(e):
+                    raise
+                failures += 1
+                with self._lock:
+                    self.retries += 1
+                delay = min(self.backoff * 2 ** (failures - 1), MAX_BACKOFF) * random.uniform(0.5, 1.0)
+                print(f"Upload of {filename} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        return response.get('id')
+
+    def upload_bytes(self, data, filename, mimetype='text/csv'):
+        if self.compress:
+            data, filename, mimetype = gzip.compress(data), filename + '.gz', 'application/gzip'
+        return self.upload_stream(io.BytesIO(data), filename, mimetype)
+
+    def upload_dataframe(self, df, filename):
+        """Upload a DataFrame as CSV straight from memory"""
+        return self.upload_bytes(df.to_csv(index=False).encode('utf-8'), filename)
+
+    def upload_file(self, path, filename=None, mimetype=None):
+        """Upload a file on disk; it is streamed as is, or gzipped into memory when compressing"""
+        filename = filename or os.path.basename(path)
+        mimetype = mimetype or MIMETYPES.get(os.path.splitext(path)[1], 'application/octet-stream')
+        with open(path, 'rb') as f:
+            if not self.compress:
+                return self.upload_stream(f, filename, mimetype)
+            buffer = io.BytesIO()
+            with gzip.GzipFile(fileobj=buffer, mode='wb') as compressed:
+                shutil.copyfileobj(f, compressed)
+            buffer.seek(0)
+            return self.upload_stream(buffer, filename + '.gz', 'application/gzip')
+
+    def upload_many(self, artifacts, max_workers=None):
+        """Upload (DataFrame or path, filename) pairs concurrently; return ids in order, None for failures"""
+        artifacts = list(artifacts)
+
+        def upload(artifact):
+            source, filename = artifact
+            try:
+                if isinstance(source, pd.DataFrame):
+                    return self.upload_dataframe(source, filename)
+                return self.upload_file(source, filename)
+            except Exception as e:
+                print(f"Error uploading {filename} to Google Drive: {e}")
+                return None
+
+        if not artifacts:
+            return []
+        self.service  # build the shared client once, before the threads need it
+        with ThreadPoolExecutor(max_workers=max_workers or min(4, len(artifacts))) as executor:
+            return list(executor.map(upload, artifacts))
@@ -0,0 +1,207 @@
+"""Warm pool of Chrome sessions, health-checked on checkout and recycled after heavy use"""
+import os
+import queue
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: launches are only serialized within one process
+    fcntl = None
+
+try:
+    import psutil
+except ImportError:  # Without it sessions are only recycled after max_navigations
+    psutil = None
+
+
+class LaunchLock:
+    """A thread lock plus an advisory file lock, so launches are serialized across county worker processes too"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(tempfile.gettempdir(), 'obituary_scraper_chrome_launch.lock')
+        self.lock = threading.Lock()
+        self.file = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        if fcntl:
+            try:
+                self.file = open(self.path, 'a')
+                fcntl.flock(self.file, fcntl.LOCK_EX)
+            except OSError:
+                self.file = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self.file:
+                fcntl.flock(self.file, fcntl.LOCK_UN)
+                self.file.close()
+                self.file = None
+        finally:
+            self.lock.release()
+
+
+# undetected-chromedriver patches one shared chromedriver binary on launch,
+# so concurrent launches are serialized
+LAUNCH_LOCK = LaunchLock()
+
+HEALTH_CHECK_SCRIPT = "return document.readyState;"
+
+
+def browser_rss_mb(driver):
+    """Resident memory in MB of a session's chromedriver and Chrome processes, or None if unknown
+
+    The JS heap resets on every navigation, so it never shows the renderer growing across lookups.
+    """
+    if psutil is None:
+        return None
+    pids = set()
+    service = getattr(driver, 'service', None)
+    if getattr(service, 'process', None):
+        pids.add(service.process.pid)
+    # undetected-chromedriver starts Chrome itself, outside chromedriver's process tree
+    if getattr(driver, 'browser_pid', None):
+        pids.add(driver.browser_pid)
+    processes = {}
+    for pid in pids:
+        try:
+            parent = psutil.Process(pid)
+            processes[pid] = parent
+            processes.update((child.pid, child) for child in parent.children(recursive=True))
+        except psutil.Error:
+            continue
+    if not processes:
+        return None
+    total = 0
+    for process in processes.values():
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+class DriverLease:
+    __slots__ = ('driver', 'navigations', 'created_at', 'broken')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.navigations = 0
+        self.created_at = time.time()
+        # Set by a borrower that saw the session fail; release() replaces it instead of pooling it
+        self.broken = False
+
+
+class DriverPool:
+    """Hand out live drivers; replace hung or dead ones and recycle after N navigations or a memory threshold"""
+
+    def __init__(self, factory, size=1, max_navigations=None, max_memory_mb=None, health_timeout=10):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.max_navigations = max_navigations or int(os.getenv('DRIVER_MAX_NAVIGATIONS', 150))
+        # Resident memory of chromedriver plus every Chrome process of the session
+        self.max_memory_mb = max_memory_mb or float(os.getenv('DRIVER_MAX_RSS_MB', 1536))
+        self.health_timeout = health_timeout
+        self.idle = queue.Queue()
+        self.closed = False
+        # Retired after max_navigations
+        self.recycled = 0
+        # Retired over max_memory_mb
+        self.memory_recycled = 0
+        # Dead or hung sessions
+        self.replaced = 0
+
+    def start(self):
+        """Pre-launch every session in the background so launch cost overlaps other work"""
+        for _ in range(self.size):
+            threading.Thread(target=self._launch_into_pool, daemon=True).start()
+
+    def _launch_into_pool(self):
+        try:
+            lease = DriverLease(self.factory())
+        except Exception as e:
+            print(f"Error pre-launching pooled driver: {e}")
+            # An empty slot: the next acquire launches synchronously
+            lease = None
+        if self.closed and lease:
+            self._retire(lease)
+            return
+        self.idle.put(lease)
+
+    def _probe(self, lease):
+        """Return True if the session answers a script in time, False if it is dead or hung"""
+        result = {}
+
+        def probe():
+            try:
+                result['state'] = lease.driver.execute_script(HEALTH_CHECK_SCRIPT)
+            except Exception as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=probe, daemon=True)
+        thread.start()
+        thread.join(self.health_timeout)
+        return not thread.is_alive() and 'error' not in result
+
+    def _retire(self, lease):
+        # quit() on a hung session can block too, so it runs on its own thread
+        def quit_driver():
+            try:
+                lease.driver.quit()
+            except:
+                pass
+        thread = threading.Thread(target=quit_driver, daemon=True)
+        thread.start()
+        return thread
+
+    def acquire(self):
+        """Return a healthy DriverLease, replacing dead or hung sessions as needed"""
+        lease = self.idle.get()
+        if lease is not None:
+            if not self._probe(lease):
+                print("Replacing unresponsive pooled driver")
+                self._retire(lease)
+                self.replaced += 1
+            else:
+                rss_mb = browser_rss_mb(lease.driver)
+                if rss_mb is None or rss_mb < self.max_memory_mb:
+                    return lease
+                print(f"Recycling pooled driver at {rss_mb:.0f} MB resident")
+                self._retire(lease)
+                self.memory_recycled += 1
+        try:
+            return DriverLease(self.factory())
+        except Exception:
+            self.idle.put(None)
+            raise
+
+    def release(self, lease):
+        """Return a lease to the pool, recycling it once it has done max_navigations"""
+        if self.closed:
+            self._retire(lease)
+        elif lease.broken:
+            self._retire(lease)
+            self.replaced += 1
+            threading.Thread(target=self._launch_into_pool, daemon=True).start()
+        elif lease.navigations >= self.max_navigations:
+            self._retire(lease)
+            self.recycled += 1
+            threading.Thread(target=self._launch_into_pool, daemon=True).start()
+        else:
+            self.idle.put(lease)
+
+    def close(self):
+        self.closed = True
+        quitting = []
+        while True:
+            try:
+                lease = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if lease is not None:
+                quitting.append(self._retire(lease))
+        for thread in quitting:
+            thread.join(self.health_timeout)
@@ -0,0 +1,215 @@
+"""Cluster obituary rows that describe the same person, across sources and name variants
+
+Rows are blocked on a Soundex code of the last name plus the first initial, and only rows
+sharing a block are compared. A pair matches when it comes from two different sources, the
+names agree and neither the date nor the age rules it out. 'Dr. William A Smith' on legacy.com and 'Bill Smith' on dispatch.com
+a day apart become one cluster, so the person is looked up once.
+"""
+import os
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+from dateutil import parser as date_parser
+
+from candidate_ranking import GENERATION_SUFFIXES, QUOTED_PATTERN, name_words
+
+# Obituaries of one death appear on different sites a few days apart
+DATE_WINDOW_DAYS = 7
+AGE_TOLERANCE = 1
+LAST_NAME_SIMILARITY = 0.85
+HONORIFICS = frozenset(['dr', 'mr', 'mrs', 'ms', 'miss', 'rev', 'reverend', 'fr', 'father', 'pastor', 'hon'])
+SOUNDEX_CODES = {letter: code for letters, code in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'), ('l', '4'),
+                                                    ('mn', '5'), ('r', '6')) for letter in letters}
+NICKNAMES = {
+    'bill': 'william', 'billy': 'william', 'will': 'william', 'willie': 'william',
+    'bob': 'robert', 'bobby': 'robert', 'rob': 'robert', 'robbie': 'robert', 'bert': 'robert',
+    'jim': 'james', 'jimmy': 'james', 'jamie': 'james',
+    'mike': 'michael', 'mick': 'michael', 'dick': 'richard', 'rick': 'richard', 'rich': 'richard',
+    'tom': 'thomas', 'tommy': 'thomas', 'chuck': 'charles', 'charlie': 'charles',
+    'jack': 'john', 'johnny': 'john', 'joe': 'joseph', 'joey': 'joseph', 'dave': 'david',
+    'ed': 'edward', 'eddie': 'edward', 'ted': 'edward', 'ron': 'ronald', 'don': 'donald',
+    'larry': 'lawrence', 'jerry': 'gerald', 'ken': 'kenneth', 'steve': 'stephen', 'steven': 'stephen',
+    'tony': 'anthony', 'andy': 'andrew', 'hank': 'henry', 'harry': 'henry', 'sam': 'samuel',
+    'peggy': 'margaret', 'maggie': 'margaret', 'meg': 'margaret', 'betty': 'elizabeth',
+    'beth': 'elizabeth', 'liz': 'elizabeth', 'patty': 'patricia', 'pat': 'patricia', 'trish': 'patricia',
+    'sue': 'susan', 'susie': 'susan', 'kathy': 'katherine', 'cathy': 'catherine', 'kate': 'katherine',
+    'debbie': 'deborah', 'deb': 'deborah', 'barb': 'barbara', 'jenny': 'jennifer', 'jen': 'jennifer',
+    'peg': 'margaret', 'dot': 'dorothy', 'dottie': 'dorothy', 'ginny': 'virginia', 'connie': 'constance',
+    'chris': 'christopher', 'fred': 'frederick', 'freddie': 'frederick', 'dan': 'daniel', 'danny': 'daniel',
+    'matt': 'matthew', 'greg': 'gregory', 'ben': 'benjamin', 'nick': 'nicholas', 'tim': 'timothy',
+    'jeff': 'jeffrey', 'doug': 'douglas', 'phil': 'phillip', 'phillip': 'phillip', 'philip': 'phillip',
+    'gene': 'eugene', 'walt': 'walter', 'vince': 'vincent', 'frank': 'francis',
+    'ray': 'raymond', 'gerry': 'gerald', 'len': 'leonard', 'lenny': 'leonard',
+    'becky': 'rebecca', 'vicky': 'victoria', 'vicki': 'victoria', 'judy': 'judith',
+    'cindy': 'cynthia', 'sandy': 'sandra', 'terri': 'theresa', 'tina': 'christina',
+    'annie': 'ann', 'anne': 'ann', 'millie': 'mildred', 'bea': 'beatrice',
+}
+
+
+def soundex(text):
+    """American Soundex code of a name, e.g. Robert and Rupert -> r163"""
+    letters = [char for char in (text or '').lower() if char.isalpha()]
+    if not letters:
+        return ''
+    code = letters[0]
+    previous = SOUNDEX_CODES.get(letters[0])
+    for char in letters[1:]:
+        digit = SOUNDEX_CODES.get(char)
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate two letters with the same code, vowels do
+        if char not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def _canonical(first):
+    return NICKNAMES.get(first, first)
+
+
+@lru_cache(maxsize=8192)
+def _parse_date(value):
+    try:
+        return date_parser.parse(value, fuzzy=True).date()
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+def _age(value):
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+class NameParts:
+    """The parts of one row's name that are compared"""
+
+    def __init__(self, row):
+        name = row.get('name') or ''
+        self.source = row.get('source')
+        self.nicknames = set(name_words(' '.join(QUOTED_PATTERN.findall(name))))
+        words = [word for word in name_words(QUOTED_PATTERN.sub(' ', name)) if word not in HONORIFICS]
+        self.last = ' '.join(name_words(row.get('last_name')))
+        first = name_words(row.get('first_name'))
+        self.first = first[0] if first and first[0] not in HONORIFICS else (words[0] if words else '')
+        self.suffix = words[-1] if words and words[-1] in GENERATION_SUFFIXES else None
+        last_words = name_words(row.get('last_name'))
+        middle = words[1:]
+        if middle and middle[-1] in GENERATION_SUFFIXES:
+            middle = middle[:-1]
+        if last_words and middle[-len(last_words):] == last_words:
+            middle = middle[:-len(last_words)]
+        self.middle_initial = middle[0][0] if middle else None
+        self.date = _parse_date(row.get('date')) if isinstance(row.get('date'), str) else None
+        self.age = _age(row.get('age'))
+
+    @property
+    def blocking_keys(self):
+        """Soundex of the last name with the initial of each form of the first name
+
+        Bill is filed under W as well as B, and a quoted nickname under its own initial.
+        """
+        code = soundex(self.last)
+        firsts = {self.first, _canonical(self.first)} | self.nicknames | {_canonical(name) for name in self.nicknames}
+        return {(code, first[:1]) for first in firsts if first}
+
+
+def first_names_match(a, b):
+    """Same given name, an initial of it, a known nickname of it or a nickname the obituary quotes
+
+    Only NICKNAMES links two different names: a shared prefix would also join Paul and Paula.
+    """
+    if not a.first or not b.first:
+        return False
+    if a.first == b.first or _canonical(a.first) == _canonical(b.first):
+        return True
+    if len(a.first) == 1 or len(b.first) == 1:
+        return a.first[0] == b.first[0]
+    return a.first in b.nicknames or b.first in a.nicknames
+
+
+def same_person(a, b, date_window=DATE_WINDOW_DAYS):
+    """Pairwise comparison of two rows' NameParts: names must agree, dates and ages must not disagree"""
+    if a.source == b.source:
+        # One site lists a person once; two of its rows that survived the dedupe are two people
+        return False
+    if a.last != b.last and SequenceMatcher(None, a.last, b.last).ratio() < LAST_NAME_SIMILARITY:
+        return False
+    if not first_names_match(a, b):
+        return False
+    if a.middle_initial and b.middle_initial and a.middle_initial != b.middle_initial:
+        return False
+    if a.suffix and b.suffix and a.suffix != b.suffix:
+        # A father and son
+        return False
+    if a.date and b.date and abs((a.date - b.date).days) > date_window:
+        return False
+    if a.age is not None and b.age is not None and abs(a.age - b.age) > AGE_TOLERANCE:
+        return False
+    return True
+
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.members = {item: [item] for item in range(size)}
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # The earlier row stays the root, so clusters keep their first row's position
+            root, child = min(a, b), max(a, b)
+            self.parent[child] = root
+            self.members[root].extend(self.members.pop(child))
+
+
+def resolve_entities(rows, date_window=None):
+    """Group rows into clusters of the same person, in order of each cluster's first row"""
+    rows = list(rows)
+    if date_window is None:
+        date_window = int(os.getenv('ENTITY_DATE_WINDOW_DAYS', DATE_WINDOW_DAYS))
+    parts = [NameParts(row) for row in rows]
+    blocks = defaultdict(list)
+    for index, part in enumerate(parts):
+        if part.last and part.first:
+            for key in part.blocking_keys:
+                blocks[key].append(index)
+
+    clusters = _DisjointSet(len(rows))
+    for members in blocks.values():
+        for position, a in enumerate(members):
+            for b in members[position + 1:]:
+                root_a, root_b = clusters.find(a), clusters.find(b)
+                if root_a == root_b or not same_person(parts[a], parts[b], date_window):
+                    continue
+                # Every pair across the two clusters must match, or 'Bill Smith' would chain
+                # William A. Smith and William B. Smith into one person
+                if all(same_person(parts[x], parts[y], date_window)
+                       for x in clusters.members[root_a] for y in clusters.members[root_b]):
+                    clusters.union(a, b)
+
+    grouped = defaultdict(list)
+    for index, row in enumerate(rows):
+        grouped[clusters.find(index)].append(row)
+    return [grouped[root] for root in sorted(grouped)]
+
+
+def cluster_lookup(cluster):
+    """(first_name, last_name, hints) for a cluster's one property lookup
+
+    The row with the fullest name leads, and the first real location among the rows is the hint.
+    """
+    lead = max(cluster, key=lambda row: len(name_words(row.get('name'))))
+    location = next((row.get('location') for row in cluster
+                     if row.get('location') and row.get('location') not in ('N/A', 'Ohio')), lead.get('location'))
+    return lead['first_name'], lead['last_name'], {'full_name': lead.get('name'), 'location': location}
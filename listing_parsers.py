@@ -0,0 +1,52 @@
+"""Page-source parsers for the listing pages, the Python counterparts of the scripts in browser_scripts.py"""
+from bs4 import BeautifulSoup
+
+LEGACY_DATE_CLASS = 'Box-sc-ucqo0b-0'
+DISPATCH_HEADER_SELECTOR = 'h2.MuiTypography-root.MuiTypography-h2.css-1cbvm0s'
+DISPATCH_CARD_SELECTOR = 'div.MuiGrid-root.MuiGrid-container.css-1rwztak'
+
+
+def parse_legacy_cards(html):
+    """Return (date header, full name) pairs for every rendered legacy.com card"""
+    soup = BeautifulSoup(html, 'html.parser')
+    current_date = None
+    pairs = []
+    for element in soup.find_all(['p', 'h4']):
+        if element.get('color') == 'neutral50' and LEGACY_DATE_CLASS in element.get('class', []):
+            current_date = element.text.strip()
+        elif element.get('data-component') == 'PersonCardFullName':
+            full_name = element.text.strip()
+            if current_date and full_name:
+                pairs.append((current_date, full_name))
+    return pairs
+
+
+def _text(element):
+    return element.get_text(strip=True) if element else None
+
+
+def parse_dispatch_cards(html):
+    """Return (date header, name, age, location) for every rendered dispatch.com card
+
+    Same output as DISPATCH_EXTRACT_SCRIPT: cards take the nearest date header above
+    them and a missing age or location is None.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    first_header = soup.select_one(DISPATCH_HEADER_SELECTOR)
+    current_date = _text(first_header)
+    cards = []
+    for element in soup.select(DISPATCH_HEADER_SELECTOR + ',' + DISPATCH_CARD_SELECTOR):
+        if element.name == 'h2':
+            current_date = _text(element)
+            continue
+        name = _text(element.select_one('h2.obit-title'))
+        if not name:
+            continue
+        age = _text(element.select_one('[aria-label="age"]'))
+        cards.append((
+            current_date,
+            name,
+            age.replace('Age ', '').strip() if age else None,
+            _text(element.select_one('[aria-label="location"]')) or None,
+        ))
+    return cards
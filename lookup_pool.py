@@ -0,0 +1,184 @@
+"""Concurrent pool of auditor lookup sessions fed from a shared work queue"""
+import queue
+import threading
+import time
+
+from auditor_client import NOT_FOUND
+
+
+class RateLimiter:
+    """Global politeness limit shared by every lookup worker"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second and rate_per_second > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller may start its next request"""
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SeleniumLookupSession:
+    """Lookup worker session that checks a Chrome driver out of the DriverPool for each search"""
+
+    def __init__(self, scraper, driver_pool):
+        self.scraper = scraper
+        self.driver_pool = driver_pool
+
+    def search_property(self, first_name, last_name, hints=None):
+        lease = self.driver_pool.acquire()
+        searched = False
+        try:
+            result = self.scraper.search_property(first_name, last_name, driver=lease.driver, hints=hints)
+            searched = True
+            return result
+        finally:
+            lease.navigations += 1
+            if searched:
+                try:
+                    self.scraper.request_blocker.collect(lease.driver, 'auditor')
+                except Exception as e:
+                    print(f"Error reading the pooled driver's performance log: {e}")
+                    lease.broken = True
+            # After a failed search the log stays buffered: get_log on a hung session would block
+            # this worker, and the next acquire() health-checks the driver before anyone reads it
+            self.driver_pool.release(lease)
+
+    def close(self):
+        pass
+
+
+class PropertyLookupPool:
+    """Run search_property for many names across N independent sessions"""
+
+    def __init__(self, session_factory, workers=1, rate_per_second=0.5, metrics=None):
+        self.session_factory = session_factory
+        # Optional RunMetrics: per-lookup latency, lookup and error counts, time spent throttled
+        self.metrics = metrics
+        self.workers = max(1, int(workers))
+        self.rate_limiter = RateLimiter(rate_per_second)
+        self.report_lock = threading.Lock()
+
+    def imap(self, names, on_result=None, cached=None, window=None, on_error=None):
+        """Yield the 5-tuple for each (first_name, last_name[, hints]) name in input order as lookups finish
+
+        A name's optional third item is a dict of hints (full_name, location) passed on to
+        search_property to choose between several owners. Names are pulled lazily and at most
+        `window` of them are in flight or waiting to be yielded, so memory stays flat however
+        long the input is. `cached(first_name, last_name, hints)` may answer a name up front;
+        a non-None answer skips the lookup and the rate limit. Each finished search is passed to
+        `on_result(first_name, last_name, result, hints)`. A search that raises is yielded as
+        NOT_FOUND but never reaches `on_result`, so it is not cached or journaled as done;
+        `on_error(first_name, last_name, hints)` is told about it instead.
+        """
+        window = max(1, int(window or self.workers * 4))
+        tasks = queue.Queue()
+        done = {}
+        condition = threading.Condition()
+        live = [0]
+        threads = []
+
+        def worker():
+            try:
+                session = self.session_factory()
+            except Exception as e:
+                # The remaining workers keep draining the queue
+                print(f"Error starting lookup session: {e}")
+                if self.metrics:
+                    self.metrics.count('lookup.session_failures')
+                with condition:
+                    live[0] -= 1
+                    condition.notify_all()
+                return
+            try:
+                while True:
+                    task = tasks.get()
+                    if task is None:
+                        return
+                    index, name = task
+                    first_name, last_name = name[:2]
+                    hints = name[2] if len(name) > 2 else None
+                    throttled = time.monotonic()
+                    self.rate_limiter.wait()
+                    started = time.monotonic()
+                    failed = False
+                    try:
+                        result = session.search_property(*name)
+                    except Exception as e:
+                        # The row is written as not found, but the failure is neither cached nor journaled
+                        print(f"Error searching property for {first_name} {last_name}: {e}")
+                        result = NOT_FOUND
+                        failed = True
+                    if self.metrics:
+                        self.metrics.observe('lookup', time.monotonic() - started)
+                        self.metrics.count('lookups')
+                        self.metrics.count('lookup.throttled_seconds', started - throttled)
+                        if failed:
+                            self.metrics.count('lookup.errors')
+                        elif result == NOT_FOUND:
+                            self.metrics.count('lookup.not_found')
+                    if failed and on_error:
+                        with self.report_lock:
+                            on_error(first_name, last_name, hints)
+                    elif not failed and on_result:
+                        with self.report_lock:
+                            on_result(first_name, last_name, result, hints)
+                    with condition:
+                        done[index] = result
+                        condition.notify_all()
+            finally:
+                if self.metrics:
+                    self.metrics.count('lookup.rejected', getattr(session, 'rejected', 0))
+                session.close()
+                with condition:
+                    live[0] -= 1
+                    condition.notify_all()
+
+        def submit(index, name):
+            result = cached(name[0], name[1], name[2] if len(name) > 2 else None) if cached else None
+            if result is not None:
+                with condition:
+                    done[index] = result
+                return
+            if len(threads) < self.workers:
+                with condition:
+                    live[0] += 1
+                thread = threading.Thread(target=worker, daemon=True)
+                thread.start()
+                threads.append(thread)
+            tasks.put((index, name))
+
+        pending = enumerate(names)
+        submitted = 0
+        next_index = 0
+        try:
+            while True:
+                while submitted - next_index < window:
+                    try:
+                        index, name = next(pending)
+                    except StopIteration:
+                        break
+                    submit(index, name)
+                    submitted += 1
+                if next_index >= submitted:
+                    return
+                with condition:
+                    # Once every session has died the rest of the names come back not found
+                    while next_index not in done and live[0] > 0:
+                        condition.wait()
+                    result = done.pop(next_index, None)
+                next_index += 1
+                yield result if result is not None else NOT_FOUND
+        finally:
+            for _ in threads:
+                tasks.put(None)
+            for thread in threads:
+                thread.join()
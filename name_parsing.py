@@ -0,0 +1,61 @@
+"""Obituary name parsing: precompiled patterns, a memoized scalar parser and a batch API"""
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+NAME_COLUMNS = ['first_name', 'last_name', 'name']
+NAME_CACHE_SIZE = 65536
+
+YEAR_RANGE_PATTERN = re.compile(r'\s*\d{4}-\d{4}\s*$')
+TRAILING_DATE_PATTERN = re.compile(
+    r'\s*(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+\d{1,2},\s+\d{4}\s*$'
+)
+NICKNAME_PATTERN = re.compile(r'\s*[\(\[].+?[\)\]]\s*')
+SUFFIXES = frozenset(['jr', 'sr', 'ii', 'iii', 'iv', 'v', 'tr'])
+EMPTY_NAME = ('', '', '')
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def split_name(full_name):
+    """Split full name into (first name, last name, cleaned full name) with special case handling"""
+    # Clean and split the name
+    name_without_dates = YEAR_RANGE_PATTERN.sub('', full_name.strip())
+    # The trailing-date and nickname patterns cannot match without these characters
+    if ',' in name_without_dates:
+        name_without_dates = TRAILING_DATE_PATTERN.sub('', name_without_dates)
+    if '(' in name_without_dates or '[' in name_without_dates:
+        name_without_dates = NICKNAME_PATTERN.sub('', name_without_dates)
+    parts = name_without_dates.split()
+
+    if len(parts) >= 2:
+        if parts[0].lower().replace('.', '') == 'dr':
+            first_name = parts[1] if len(parts) > 2 else parts[0]
+        else:
+            first_name = parts[0]
+
+        last_word = parts[-1].lower().replace('.', '')
+        if last_word in SUFFIXES or (len(last_word) == 1 and last_word.isalpha()):
+            last_name = parts[-2]
+        else:
+            last_name = parts[-1]
+
+        return first_name, last_name, ' '.join(parts)
+
+    return full_name, '', full_name
+
+
+def split_names(names):
+    """Parse a sequence or Series of raw names into a first_name/last_name/name frame
+
+    Each distinct name is parsed once; nulls and non-strings come back as empty strings.
+    The result keeps the index of a Series input.
+    """
+    names = names if isinstance(names, pd.Series) else pd.Series(list(names), dtype=object)
+    codes, uniques = pd.factorize(names)
+    # Nulls get code -1, which picks the trailing empty row
+    table = np.empty((len(uniques) + 1, len(NAME_COLUMNS)), dtype=object)
+    table[:] = [split_name(name) if isinstance(name, str) else EMPTY_NAME for name in uniques] + [EMPTY_NAME]
+    return pd.DataFrame(table[codes], index=names.index, columns=NAME_COLUMNS)
@@ -0,0 +1,77 @@
+"""Indexed in-memory store for scraped obituary records"""
+import threading
+
+import pandas as pd
+
+
+class ObituaryRecord:
+    __slots__ = ('first_name', 'last_name', 'name', 'date', 'source', 'age', 'location', 'tag')
+
+    def __init__(self, first_name, last_name, name, date, source, age='N/A', location='N/A', tag=None):
+        self.first_name = first_name
+        self.last_name = last_name
+        self.name = name
+        self.date = date
+        self.source = source
+        self.age = age
+        self.location = location
+        self.tag = tag
+
+    @property
+    def key(self):
+        return (self.first_name, self.last_name, self.date, self.source)
+
+
+class ObituaryStore:
+    """Insertion-ordered records with a hash index on (first, last, date, source)"""
+
+    COLUMNS = ['first_name', 'last_name', 'name', 'date', 'source', 'age', 'location']
+
+    def __init__(self):
+        # dicts keep insertion order, so the index doubles as the record list
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def add(self, first_name, last_name, name, date, source, age='N/A', location='N/A', tag=None):
+        """Insert a record unless one with the same key exists; return it if it was new, else None"""
+        record = ObituaryRecord(first_name, last_name, name, date, source, age, location, tag)
+        with self._lock:
+            if record.key in self._index:
+                return None
+            self._index[record.key] = record
+        return record
+
+    def add_rows(self, rows):
+        """Insert rows shaped like iter_rows() output, e.g. from a run checkpoint"""
+        for row in rows:
+            self.add(
+                row['first_name'], row['last_name'], row['name'], row['date'], row['source'],
+                age=row.get('age', 'N/A'), location=row.get('location', 'N/A'), tag=row.get('Tag')
+            )
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(list(self._index.values()))
+
+    def iter_rows(self):
+        """Yield each record as a row dict, with a 'Tag' column when any record is tagged"""
+        records = list(self._index.values())
+        tagged = any(record.tag is not None for record in records)
+        for record in records:
+            row = {column: getattr(record, column) for column in self.COLUMNS}
+            if tagged:
+                row['Tag'] = record.tag
+            yield row
+
+    def to_dataframe(self):
+        """All records as one DataFrame in insertion order, with a 'Tag' column when any record is tagged"""
+        records = list(self._index.values())
+        data = {column: [getattr(record, column) for record in records] for column in self.COLUMNS}
+        if any(record.tag is not None for record in records):
+            data['Tag'] = [record.tag for record in records]
+        return pd.DataFrame(data, columns=list(data))
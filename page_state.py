@@ -0,0 +1,163 @@
+"""Browserless listing fetch: decode obituaries from the state JSON embedded in the page HTML"""
+import json
+import re
+from datetime import datetime, timezone
+
+import requests
+from bs4 import BeautifulSoup
+from dateutil import parser as date_parser
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# window.__APOLLO_STATE__ = {...};  window.__INITIAL_STATE__ = {...}; etc.
+ASSIGNED_STATE_PATTERN = re.compile(
+    r'window\.(__[A-Z_]+__)\s*=\s*(\{.*?\})\s*;?\s*(?:</script>|window\.)',
+    re.DOTALL
+)
+
+NAME_KEYS = ('fullName', 'decedentName', 'name')
+DATE_KEYS = ('publishedDate', 'publishDate', 'datePublished', 'publishedAt', 'publicationDate',
+             'createdDate', 'dateOfDeath', 'deathDate', 'date')
+AGE_KEYS = ('age', 'ageAtDeath')
+LOCATION_KEYS = ('location', 'city', 'cityState')
+
+
+def fetch_listing(url, timeout=20):
+    response = requests.get(url, headers={
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Language': 'en-US,en;q=0.9'
+    }, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def extract_embedded_state(html):
+    """Return (label, blob) for every JSON state blob found in the page
+
+    The label is '__NEXT_DATA__', the variable of a window.__X__ assignment, the id of
+    any other JSON script tag, or its type when it has no id (e.g. 'application/ld+json').
+    """
+    blobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup.find_all('script'):
+        content = script.string or ''
+        if not content.strip():
+            continue
+        if script.get('id') == '__NEXT_DATA__' or script.get('type') in ('application/json', 'application/ld+json'):
+            try:
+                blobs.append((script.get('id') or script.get('type'), json.loads(content)))
+            except ValueError:
+                continue
+        else:
+            for match in ASSIGNED_STATE_PATTERN.finditer(content + '</script>'):
+                try:
+                    blobs.append((match.group(1), json.loads(match.group(2))))
+                except ValueError:
+                    continue
+    return blobs
+
+
+def state_at_path(blobs, path):
+    """The node under `path` (a blob label, then dict keys), or None if no blob has it"""
+    label, keys = path[0], path[1:]
+    for blob_label, node in blobs:
+        if blob_label != label:
+            continue
+        for key in keys:
+            if not isinstance(node, dict) or key not in node:
+                node = None
+                break
+            node = node[key]
+        if node is not None:
+            return node
+    return None
+
+
+def _text_name(value):
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, dict):
+        if value.get('fullName'):
+            return str(value['fullName']).strip()
+        parts = [value.get(key) for key in ('firstName', 'middleName', 'lastName', 'suffix')]
+        joined = ' '.join(str(part).strip() for part in parts if part)
+        return joined or None
+    return None
+
+
+def _header_date(value):
+    """Render an ISO/epoch date like the listing headers do, e.g. 'October 15, 2024'"""
+    try:
+        if isinstance(value, (int, float)):
+            parsed = datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz=timezone.utc)
+        else:
+            parsed = date_parser.parse(str(value))
+    except (ValueError, OverflowError, TypeError):
+        return str(value) if value else None
+    return f"{parsed:%B} {parsed.day}, {parsed.year}"
+
+
+def _location_text(value):
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, dict):
+        city = _text_name(value.get('city')) if isinstance(value.get('city'), dict) else value.get('city')
+        state = value.get('state')
+        if isinstance(state, dict):
+            state = state.get('code') or state.get('fullName') or state.get('name')
+        parts = [str(part).strip() for part in (city, state) if part]
+        return ', '.join(parts) or None
+    return None
+
+
+def _first(obj, keys):
+    for key in keys:
+        if obj.get(key) not in (None, '', [], {}):
+            return obj[key]
+    return None
+
+
+def iter_obituary_objects(state):
+    """Yield dicts that carry both a person name and a date, without descending into them"""
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            name = _text_name(_first(node, NAME_KEYS))
+            if name and _first(node, DATE_KEYS) is not None:
+                yield node
+            else:
+                stack.extend(reversed(list(node.values())))
+
+
+def parse_listing_state(html, state_paths):
+    """Decode (date header, full name, age, location) tuples from the listing in a page's embedded state
+
+    Only the node under the first of `state_paths` that resolves is searched, so trending
+    lists, ads and ld+json elsewhere in the page never become records. Returns [] when
+    none resolves; the caller then parses the rendered cards instead.
+    """
+    cards = []
+    seen = set()
+    blobs = extract_embedded_state(html)
+    listing = next((node for node in (state_at_path(blobs, path) for path in state_paths) if node is not None), None)
+    if listing is not None:
+        for obj in iter_obituary_objects(listing):
+            name = _text_name(_first(obj, NAME_KEYS))
+            date = _header_date(_first(obj, DATE_KEYS))
+            # Two people of the same name can die the same day; the site's id tells them apart
+            key = obj.get('id') or (name, date)
+            if key in seen:
+                continue
+            seen.add(key)
+            age = _first(obj, AGE_KEYS)
+            cards.append((
+                date,
+                name,
+                str(age).replace('Age ', '').strip() if age is not None else None,
+                _location_text(_first(obj, LOCATION_KEYS))
+            ))
+    return cards
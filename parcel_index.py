@@ -0,0 +1,339 @@
+"""Offline owner index built from the county's bulk parcel extract, so most names resolve without the auditor site
+
+Drop the county's parcel/owner extract (CSV, .csv.gz or a .zip holding one CSV) into the
+extract directory. refresh() loads the newest one into a local SQLite index keyed on
+normalized (last, first) owner names. Each extract is a full snapshot, and a new one only
+rewrites the parcels whose row changed and drops the parcels it no longer lists.
+
+Usage: python parcel_index.py refresh [--county KEY] [--extract-dir DIR]
+       python parcel_index.py lookup LAST FIRST [--county KEY]
+"""
+import argparse
+import csv
+import glob
+import gzip
+import hashlib
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+import zipfile
+
+from candidate_ranking import ENTITY_WORDS, GENERATION_SUFFIXES, TRUST_WORDS, Person, best_candidate, name_words
+from config import get_state_dir
+
+EXTRACT_PATTERNS = ('*.csv', '*.csv.gz', '*.zip')
+OWNER_SPLIT_PATTERN = re.compile(r'\s*(?:&|\band\b|/)\s*', re.IGNORECASE)
+# Extract headers differ between counties and years; they are compared upper-case with
+# everything but letters and digits removed
+COLUMN_ALIASES = {
+    'parcel': ['PARCELID', 'PARCEL', 'PARCELNUMBER', 'PARCELNO', 'PIN'],
+    'owner': ['OWNER', 'OWNERNAME', 'OWNER1', 'OWNERNAME1', 'OWNERNM1'],
+    'owner2': ['OWNER2', 'OWNERNAME2', 'OWNERNM2'],
+    'mailing_name': ['MAILINGNAME', 'MAILNAME', 'OWNERMAILING', 'MAILINGNAME1'],
+    'mailing_address': ['MAILINGADDRESS', 'MAILADDRESS', 'MAILADDR', 'MAILADDR1', 'MAILINGADDRESS1'],
+    'mailing_city': ['MAILINGCITY', 'MAILCITY'],
+    'mailing_state': ['MAILINGSTATE', 'MAILSTATE', 'MAILST'],
+    'mailing_zip': ['MAILINGZIP', 'MAILZIP', 'MAILZIPCODE', 'MAILINGZIPCODE'],
+    'site_address': ['SITEADDRESS', 'SITEADDR', 'PROPERTYADDRESS', 'LOCATIONADDRESS', 'LOCADDR'],
+    'city': ['SITECITY', 'PROPERTYCITY', 'CITYVILLAGE', 'CITY'],
+    'zip_code': ['SITEZIP', 'PROPERTYZIP', 'ZIPCODE', 'ZIP'],
+}
+REQUIRED_COLUMNS = ('parcel', 'owner')
+
+
+def name_key(first_name, last_name):
+    """Index key for a person: normalized surname words and the first given name"""
+    first = name_words(first_name)[:1]
+    return f"{' '.join(name_words(last_name))}|{first[0] if first else ''}"
+
+
+def owner_keys(*owners):
+    """Every name key a surname-first owner field could be looked up under
+
+    'SMITH JOHN A & MARY B' gives smith|john and smith|mary. Two-word surnames are covered
+    by also keying the first two words as the surname. Businesses and public bodies get no keys.
+    """
+    keys = set()
+    for owner in owners:
+        if not owner or ENTITY_WORDS.intersection(name_words(owner)):
+            continue
+        last = None
+        for part in OWNER_SPLIT_PATTERN.split(owner):
+            words = [word for word in name_words(part) if word not in GENERATION_SUFFIXES | TRUST_WORDS]
+            if not words:
+                continue
+            if last is None or len(words) > 1:
+                # A surname-first owner: SMITH JOHN, GARCIA LOPEZ MARIA
+                for size in (1, 2):
+                    if len(words) > size:
+                        keys.add(f"{' '.join(words[:size])}|{words[size]}")
+            if last is not None:
+                # A co-owner sharing the primary owner's surname: SMITH JOHN & MARY
+                keys.add(f"{last}|{words[0]}")
+            if last is None and len(words) > 1:
+                last = words[0]
+    return keys
+
+
+def _header_map(header):
+    normalized = [re.sub(r'[^A-Z0-9]', '', column.upper()) for column in header]
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[field] = normalized.index(alias)
+                break
+    missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        raise ValueError(f"Parcel extract has no {', '.join(missing)} column; headers: {', '.join(header)}")
+    return columns
+
+
+def _open_extract(path):
+    """Text stream of an extract file, unpacking .gz and single-CSV .zip files"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8-sig', newline='')
+    if path.endswith('.zip'):
+        archive = zipfile.ZipFile(path)
+        names = [name for name in archive.namelist() if name.lower().endswith(('.csv', '.txt'))]
+        if not names:
+            raise ValueError(f"No CSV file inside {path}")
+        return io.TextIOWrapper(archive.open(names[0]), encoding='utf-8-sig', newline='')
+    return open(path, encoding='utf-8-sig', newline='')
+
+
+def read_extract(path):
+    """Yield (parcel, owner, owner2, result 5-tuple) for every row of a bulk extract"""
+    with _open_extract(path) as f:
+        reader = csv.reader(f)
+        columns = _header_map(next(reader))
+
+        for row in reader:
+            def value(field):
+                position = columns.get(field)
+                return ' '.join(row[position].split()) if position is not None and position < len(row) else ''
+
+            parcel = value('parcel')
+            owner = value('owner')
+            if not parcel or not owner:
+                continue
+            owner2 = value('owner2')
+            mailing_line = ' '.join(part for part in (value('mailing_city'), value('mailing_state'), value('mailing_zip')) if part)
+            contact_address = '\n'.join(part for part in (value('mailing_address'), mailing_line) if part)
+            result = (
+                value('mailing_name') or '\n'.join(part for part in (owner, owner2) if part),
+                contact_address or value('site_address'),
+                value('site_address'),
+                value('city'),
+                value('zip_code'),
+            )
+            yield parcel, owner, owner2, result
+
+
+def index_path(state_dir=None):
+    return os.getenv('PARCEL_INDEX_PATH') or os.path.join(state_dir or get_state_dir(), 'parcel_index.sqlite3')
+
+
+def extract_directory(state_dir=None):
+    return os.getenv('PARCEL_EXTRACT_DIR') or os.path.join(state_dir or get_state_dir(), 'parcel_extracts')
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParcelIndex:
+    """Parcels and their owner name keys in SQLite, refreshed from the newest bulk extract"""
+
+    def __init__(self, path=None, extract_dir=None, state_dir=None):
+        self.path = path or index_path(state_dir)
+        self.extract_dir = extract_dir or extract_directory(state_dir)
+        # Names answered locally; every miss goes on to the live lookups and is counted there
+        self.hits = 0
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS parcels (
+                parcel TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                owner_mailing TEXT,
+                contact_address TEXT,
+                site_address TEXT,
+                city TEXT,
+                zip_code TEXT,
+                row_digest TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS owner_keys (
+                name_key TEXT NOT NULL,
+                parcel TEXT NOT NULL,
+                PRIMARY KEY (name_key, parcel)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_owner_keys_parcel ON owner_keys (parcel);
+            CREATE TABLE IF NOT EXISTS extracts (
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                file_digest TEXT NOT NULL,
+                parcels INTEGER NOT NULL,
+                added INTEGER NOT NULL,
+                changed INTEGER NOT NULL,
+                removed INTEGER NOT NULL,
+                loaded_at REAL NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM parcels").fetchone()[0]
+
+    def extract_files(self):
+        """Extract files in the extract directory, oldest first"""
+        paths = [path for pattern in EXTRACT_PATTERNS for path in glob.glob(os.path.join(self.extract_dir, pattern))]
+        return sorted(paths, key=os.path.getmtime)
+
+    def last_extract(self):
+        return self.conn.execute(
+            "SELECT path, size, mtime, file_digest FROM extracts ORDER BY loaded_at DESC LIMIT 1"
+        ).fetchone()
+
+    def refresh(self):
+        """Load the newest extract if it has not been loaded yet; return its load summary or None"""
+        paths = self.extract_files()
+        if not paths:
+            return None
+        path = paths[-1]
+        stat = os.stat(path)
+        with self.lock:
+            last = self.last_extract()
+            if last and last[:3] == (path, stat.st_size, stat.st_mtime):
+                return None
+            file_digest = _file_digest(path)
+            if last and last[3] == file_digest:
+                # The same extract dropped in again under a new name or timestamp
+                self._record_extract(path, stat, file_digest, (0, 0, 0, 0))
+                return None
+            counts = self._load(path)
+            self._record_extract(path, stat, file_digest, counts)
+        summary = dict(zip(('parcels', 'added', 'changed', 'removed'), counts), path=path)
+        print(f"Parcel index loaded {os.path.basename(path)}: {summary['parcels']} parcels, "
+              f"{summary['added']} added, {summary['changed']} changed, {summary['removed']} removed")
+        return summary
+
+    def _record_extract(self, path, stat, file_digest, counts):
+        self.conn.execute(
+            "INSERT INTO extracts (path, size, mtime, file_digest, parcels, added, changed, removed, loaded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime, file_digest) + tuple(counts) + (time.time(),)
+        )
+        self.conn.commit()
+
+    def _load(self, path):
+        """Apply one full extract in a single transaction: write new and changed parcels, drop missing ones"""
+        existing = dict(self.conn.execute("SELECT parcel, row_digest FROM parcels"))
+        seen = set()
+        added = changed = 0
+        try:
+            for parcel, owner, owner2, result in read_extract(path):
+                if parcel in seen:
+                    continue
+                seen.add(parcel)
+                row_digest = hashlib.sha1('\x1f'.join((owner, owner2) + result).encode('utf-8')).hexdigest()
+                previous = existing.get(parcel)
+                if previous == row_digest:
+                    continue
+                if previous is None:
+                    added += 1
+                else:
+                    changed += 1
+                    self.conn.execute("DELETE FROM owner_keys WHERE parcel = ?", (parcel,))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO parcels (parcel, owner, owner_mailing, contact_address, site_address, "
+                    "city, zip_code, row_digest) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (parcel, owner) + result + (row_digest,)
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO owner_keys (name_key, parcel) VALUES (?, ?)",
+                    [(key, parcel) for key in owner_keys(owner, owner2)]
+                )
+            removed = [(parcel,) for parcel in existing if parcel not in seen]
+            self.conn.executemany("DELETE FROM owner_keys WHERE parcel = ?", removed)
+            self.conn.executemany("DELETE FROM parcels WHERE parcel = ?", removed)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return len(seen), added, changed, len(removed)
+
+    def candidates(self, first_name, last_name):
+        """Parcels owned under a name, shaped like parsed auditor search rows"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT p.parcel, p.owner, p.owner_mailing, p.contact_address, p.site_address, p.city, p.zip_code "
+                "FROM owner_keys k JOIN parcels p ON p.parcel = k.parcel WHERE k.name_key = ?",
+                (name_key(first_name, last_name),)
+            ).fetchall()
+        return [{'index': index, 'parcel': row[0], 'owner': row[1], 'address': row[4], 'city': row[5],
+                 'result': tuple(value or '' for value in row[2:])} for index, row in enumerate(rows)]
+
+    def lookup(self, first_name, last_name, hints=None):
+        """Return the best-matching parcel's 5-tuple, or None so the caller falls back to the auditor site"""
+        best = best_candidate(self.candidates(first_name, last_name), Person(first_name, last_name, **(hints or {})))
+        if best is None:
+            return None
+        with self.lock:
+            self.hits += 1
+        return best['result']
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def open_parcel_index(state_dir=None):
+    """The county's ParcelIndex, or None when $PARCEL_INDEX=0 or there is neither an index nor an extract yet"""
+    if os.getenv('PARCEL_INDEX', '1') == '0':
+        return None
+    if not os.path.exists(index_path(state_dir)) and not any(
+            glob.glob(os.path.join(extract_directory(state_dir), pattern)) for pattern in EXTRACT_PATTERNS):
+        return None
+    return ParcelIndex(state_dir=state_dir)
+
+
+def main():
+    from counties import get_county
+
+    parser = argparse.ArgumentParser(description="Build or query the offline parcel owner index")
+    parser.add_argument('command', choices=['refresh', 'lookup'])
+    parser.add_argument('names', nargs='*', help="LAST FIRST for lookup")
+    parser.add_argument('--county', default=None, help="County from counties.json (defaults to $COUNTY or franklin)")
+    parser.add_argument('--extract-dir', default=None, help="Directory of extracts (defaults to $PARCEL_EXTRACT_DIR)")
+    args = parser.parse_args()
+
+    index = ParcelIndex(extract_dir=args.extract_dir, state_dir=get_county(args.county).state_dir)
+    try:
+        if args.command == 'refresh':
+            if index.refresh() is None:
+                print(f"Parcel index is up to date ({len(index)} parcels)")
+        else:
+            if len(args.names) != 2:
+                parser.error("lookup takes LAST FIRST")
+            last_name, first_name = args.names
+            start = time.perf_counter()
+            result = index.lookup(first_name, last_name)
+            elapsed = (time.perf_counter() - start) * 1e6
+            print(f"{result if result else 'Not in the parcel index'} ({elapsed:.0f} us)")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Typed Parquet export of the output CSV: real dates, nullable ages, categoricals, nulls for sentinels
+
+Usage: python parquet_export.py obituaries_with_property_10_15_24.csv [...]
+"""
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from auditor_client import NOT_ON_AUDITOR
+from scrape_state import parse_header_date
+
+# Placeholders written for missing values; they become real nulls
+NULL_PLACEHOLDERS = [NOT_ON_AUDITOR, 'N/A', '']
+# Low-cardinality text stored dictionary-encoded
+CATEGORY_COLUMNS = ['source', 'location', 'Tag', 'city', 'Mailing City', 'Mailing State', 'Property City', 'Property State']
+# The column whose sentinel marks a name that was not found on the auditor site
+STATUS_COLUMNS = ['owner_mailing', 'Mailing address']
+CHUNK_ROWS = 100000
+
+
+def parse_dates(values):
+    """Parse listing date headers such as 'October 15, 2024' to datetime64, NaT where unparseable"""
+    parsed = pd.to_datetime(values, format='%B %d, %Y', errors='coerce')
+    leftover = values.notna() & parsed.isna()
+    if leftover.any():
+        # Anything in another format goes through the same fuzzy parser the scrapers use
+        fallback = {value: parse_header_date(value) for value in values[leftover].unique()}
+        parsed[leftover] = pd.to_datetime(values[leftover].map(fallback), errors='coerce')
+    return parsed
+
+
+def typed_frame(df):
+    """Convert an output batch of text columns to the analytics schema"""
+    df = df.copy()
+    status_column = next((column for column in STATUS_COLUMNS if column in df.columns), None)
+    if status_column:
+        df['on_auditor'] = (df[status_column].astype('string') != NOT_ON_AUDITOR).astype('boolean')
+
+    for column in df.columns:
+        if column != 'on_auditor':
+            values = df[column].astype('string')
+            df[column] = values.mask(values.isin(NULL_PLACEHOLDERS))
+
+    if 'date' in df.columns:
+        df['date'] = parse_dates(df['date'])
+    if 'age' in df.columns:
+        df['age'] = pd.to_numeric(df['age'].str.extract(r'(\d{1,3})', expand=False), errors='coerce').astype('Int64')
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def arrow_schema(schema):
+    """Pin types that vary between batches: dates, string width and dictionary index width"""
+    fields = []
+    for field in schema:
+        if field.name == 'date':
+            field = field.with_type(pa.date32())
+        elif pa.types.is_dictionary(field.type):
+            field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+        elif pa.types.is_large_string(field.type) or pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+def export_parquet(csv_path, parquet_path=None, chunk_rows=CHUNK_ROWS, compression='zstd'):
+    """Write a typed Parquet copy of an output CSV, one row group per chunk; return its path"""
+    parquet_path = parquet_path or os.path.splitext(csv_path)[0] + '.parquet'
+    writer = None
+    try:
+        chunks = pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+        for chunk in chunks:
+            table = pa.Table.from_pandas(typed_frame(chunk), preserve_index=False)
+            if writer is None:
+                schema = arrow_schema(table.schema)
+                writer = pq.ParquetWriter(parquet_path, schema, compression=compression)
+            writer.write_table(table.cast(schema))
+    except pd.errors.EmptyDataError:
+        return None
+    finally:
+        if writer:
+            writer.close()
+    return parquet_path
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        print(export_parquet(path))
@@ -0,0 +1,103 @@
+"""Persistent SQLite cache of auditor lookup results"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from auditor_client import NOT_ON_AUDITOR
+from candidate_ranking import Person
+from config import get_state_dir
+
+DAY = 24 * 60 * 60
+
+
+def cache_key(first_name, last_name, hints=None):
+    """Normalized (last, first) key so case and spacing differences share one entry
+
+    The middle initial, suffix and town from the hints pick which owner is ranked best,
+    so when they are known they are part of the key: John A Smith Jr of Dublin and
+    John Smith of Hilliard get separate entries.
+    """
+    last = ' '.join(str(last_name or '').split()).lower()
+    first = ' '.join(str(first_name or '').split()).lower()
+    if hints:
+        person = Person(first_name, last_name, **hints)
+        if person.middle_initial or person.suffix or person.town:
+            return f"{last}|{first}|{person.middle_initial or ''}|{person.suffix or ''}|{' '.join(person.town)}"
+    return f"{last}|{first}"
+
+
+class PropertyCache:
+    """search_property results keyed on the normalized name, with TTLs and a size bound"""
+
+    def __init__(self, path=None, positive_ttl=None, negative_ttl=None, max_entries=None, state_dir=None):
+        self.path = path or os.getenv('PROPERTY_CACHE_PATH') or os.path.join(state_dir or get_state_dir(), 'property_cache.sqlite3')
+        # Hits stay valid for a month, NOTONAUDITOR misses are re-checked after a few days
+        self.positive_ttl = positive_ttl if positive_ttl is not None else float(os.getenv('CACHE_POSITIVE_TTL_DAYS', 30)) * DAY
+        self.negative_ttl = negative_ttl if negative_ttl is not None else float(os.getenv('CACHE_NEGATIVE_TTL_DAYS', 3)) * DAY
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('CACHE_MAX_ENTRIES', 50000))
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS property_results (
+                name_key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                found INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_property_results_used ON property_results (used_at)")
+        self.conn.commit()
+
+    def get(self, first_name, last_name, hints=None):
+        """Return the cached 5-tuple, or None when absent or expired"""
+        key = cache_key(first_name, last_name, hints)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT result, found, stored_at FROM property_results WHERE name_key = ?", (key,)
+            ).fetchone()
+            if row:
+                result, found, stored_at = row
+                ttl = self.positive_ttl if found else self.negative_ttl
+                if now - stored_at <= ttl:
+                    self.conn.execute("UPDATE property_results SET used_at = ? WHERE name_key = ?", (now, key))
+                    self.conn.commit()
+                    self.hits += 1
+                    return tuple(json.loads(result))
+                self.conn.execute("DELETE FROM property_results WHERE name_key = ?", (key,))
+                self.conn.commit()
+            self.misses += 1
+            return None
+
+    def put(self, first_name, last_name, result, hints=None):
+        key = cache_key(first_name, last_name, hints)
+        found = int(any(value != NOT_ON_AUDITOR for value in result))
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO property_results (name_key, result, found, stored_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(list(result)), found, now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries"""
+        count = self.conn.execute("SELECT COUNT(*) FROM property_results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM property_results WHERE name_key IN "
+                "(SELECT name_key FROM property_results ORDER BY used_at LIMIT ?)",
+                (excess,)
+            )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
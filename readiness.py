@@ -0,0 +1,154 @@
+"""Event-driven readiness waits with per-call deadlines and per-call-site timing"""
+import random
+import threading
+import time
+from collections import defaultdict
+
+# Installs (once per document) an in-flight XHR/fetch counter and a MutationObserver,
+# then reports their state. Attribute changes are ignored so our own data-obit-seen
+# markers do not keep the DOM "busy".
+PROBE_SCRIPT = """
+if (!window.__obitProbe) {
+    var probe = window.__obitProbe = {inflight: 0, lastMutation: Date.now(), lastNetwork: Date.now()};
+    var done = function () { probe.inflight = Math.max(0, probe.inflight - 1); probe.lastNetwork = Date.now(); };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        probe.inflight++;
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            probe.inflight++;
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+    new MutationObserver(function () { probe.lastMutation = Date.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+}
+var p = window.__obitProbe;
+return {
+    readyState: document.readyState,
+    inflight: p.inflight,
+    sinceMutation: Date.now() - p.lastMutation,
+    sinceNetwork: Date.now() - p.lastNetwork
+};
+"""
+
+
+def retry_backoff(attempt, base=1.0, cap=8.0):
+    """Seconds before retry number `attempt` (from 1): doubling from `base`, capped at `cap`, jittered"""
+    return min(base * 2 ** (attempt - 1), cap) * random.uniform(0.5, 1.0)
+
+
+def _probe(driver):
+    return driver.execute_script(PROBE_SCRIPT)
+
+
+def document_ready():
+    return lambda driver: driver.execute_script("return document.readyState") == 'complete'
+
+
+def network_idle(quiet=0.5):
+    """No XHR/fetch in flight for `quiet` seconds and the document has finished loading"""
+    def condition(driver):
+        state = _probe(driver)
+        return (state['readyState'] == 'complete' and state['inflight'] == 0
+                and state['sinceNetwork'] >= quiet * 1000)
+    return condition
+
+
+def dom_quiescent(quiet=0.3):
+    """No DOM insertions/removals/text changes for `quiet` seconds"""
+    return lambda driver: _probe(driver)['sinceMutation'] >= quiet * 1000
+
+
+def element_present(selector):
+    return lambda driver: driver.execute_script("return document.querySelector(arguments[0]) !== null;", selector)
+
+
+def element_absent(selector):
+    return lambda driver: driver.execute_script("return document.querySelector(arguments[0]) === null;", selector)
+
+
+def element_count(driver, selector):
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", selector)
+
+
+def element_count_changed(selector, previous):
+    return lambda driver: element_count(driver, selector) != previous
+
+
+def script_value_changed(script, previous):
+    """e.g. script_value_changed('return document.body.scrollHeight', last_height)"""
+    return lambda driver: driver.execute_script(script) != previous
+
+
+def text_present(text):
+    return lambda driver: driver.execute_script(
+        "return document.body !== null && document.body.innerText.indexOf(arguments[0]) >= 0;", text
+    )
+
+
+def any_of(*conditions):
+    return lambda driver: any(condition(driver) for condition in conditions)
+
+
+def all_of(*conditions):
+    return lambda driver: all(condition(driver) for condition in conditions)
+
+
+class ReadinessWaiter:
+    """Poll a condition until it holds or its deadline passes, timing every wait by call site"""
+
+    def __init__(self, poll_interval=0.1):
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.calls = defaultdict(int)
+        self.timeouts = defaultdict(int)
+        self.total_seconds = defaultdict(float)
+        self.max_seconds = defaultdict(float)
+
+    def wait(self, driver, condition, timeout, site):
+        """Return True once condition(driver) holds, False if `timeout` seconds pass first"""
+        start = time.monotonic()
+        satisfied = False
+        while True:
+            try:
+                satisfied = bool(condition(driver))
+            except Exception:
+                # Page mid-navigation or script context gone; keep polling until the deadline
+                satisfied = False
+            if satisfied or time.monotonic() - start >= timeout:
+                break
+            time.sleep(self.poll_interval)
+
+        elapsed = time.monotonic() - start
+        with self.lock:
+            self.calls[site] += 1
+            self.total_seconds[site] += elapsed
+            self.max_seconds[site] = max(self.max_seconds[site], elapsed)
+            if not satisfied:
+                self.timeouts[site] += 1
+        return satisfied
+
+    def report(self):
+        """Per-call-site wait statistics, slowest total first"""
+        with self.lock:
+            sites = sorted(self.calls, key=lambda site: self.total_seconds[site], reverse=True)
+            return [{
+                'site': site,
+                'calls': self.calls[site],
+                'total_seconds': round(self.total_seconds[site], 3),
+                'mean_seconds': round(self.total_seconds[site] / self.calls[site], 3),
+                'max_seconds': round(self.max_seconds[site], 3),
+                'timeouts': self.timeouts[site],
+            } for site in sites]
+
+    def summary_lines(self):
+        return [
+            f"{row['site']}: {row['calls']} waits, {row['total_seconds']:.1f}s total, "
+            f"{row['mean_seconds']:.2f}s mean, {row['max_seconds']:.2f}s max, {row['timeouts']} timeouts"
+            for row in self.report()
+        ]
@@ -0,0 +1,68 @@
+"""Streaming CSV sink that appends enriched rows to the output file in bounded batches"""
+import os
+
+import pandas as pd
+
+
+def drop_duplicate_rows(rows, subset):
+    """Pass rows through, skipping any whose values for `subset` were already seen"""
+    seen = set()
+    for row in rows:
+        key = tuple(row[column] for column in subset)
+        if key not in seen:
+            seen.add(key)
+            yield row
+
+
+class CSVRecordSink:
+    """Buffer at most batch_size rows, then append them to the CSV and flush them to disk
+
+    `transform` gets each batch as a DataFrame before it is written, for column-wise
+    stages such as address splitting. The header comes from the first batch and later
+    batches are aligned to it.
+    """
+
+    def __init__(self, path, batch_size=None, transform=None):
+        self.path = path
+        self.batch_size = max(1, int(batch_size or os.getenv('SINK_BATCH_SIZE', 25)))
+        self.transform = transform
+        self.columns = None
+        self.rows_written = 0
+        self.buffer = []
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+
+    def write(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Append the buffered rows to the file and push them to disk"""
+        if not self.buffer:
+            return
+        df = pd.DataFrame(self.buffer)
+        if self.transform:
+            df = self.transform(df)
+        if self.columns is None:
+            self.columns = list(df.columns)
+            df.to_csv(self.file, index=False)
+        else:
+            df.reindex(columns=self.columns).to_csv(self.file, index=False, header=False)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.rows_written += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        if self.file.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
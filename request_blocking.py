@@ -0,0 +1,124 @@
+"""Per-source request blocking for headless Chrome via CDP Network.setBlockedURLs"""
+import json
+import threading
+from collections import defaultdict
+
+RESOURCE_TYPE_EXTENSIONS = {
+    'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico'],
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'media': ['mp4', 'webm', 'mp3', 'm3u8'],
+    'stylesheet': ['css'],
+}
+
+
+def extension_patterns(extension):
+    """Blocked-URL wildcards for one extension, with and without a query string
+
+    CDN assets are mostly served as photo.jpg?w=300&auto=format, which '*.jpg' alone misses.
+    """
+    return [f'*.{extension}', f'*.{extension}?*']
+
+
+RESOURCE_TYPE_PATTERNS = {
+    resource_type: [pattern for extension in extensions for pattern in extension_patterns(extension)]
+    for resource_type, extensions in RESOURCE_TYPE_EXTENSIONS.items()
+}
+
+AD_AND_TRACKER_PATTERNS = [
+    '*doubleclick.net*', '*googlesyndication.com*', '*googletagservices.com*', '*googletagmanager.com*',
+    '*google-analytics.com*', '*amazon-adsystem.com*', '*adnxs.com*', '*pubmatic.com*',
+    '*rubiconproject.com*', '*criteo.*', '*taboola.com*', '*outbrain.com*', '*moatads.com*',
+    '*scorecardresearch.com*', '*quantserve.com*', '*chartbeat.*', '*facebook.net*',
+    '*hotjar.com*', '*nr-data.net*', '*newrelic.com*',
+]
+
+# Stylesheets stay allowed everywhere: the scroll loops rely on real layout heights
+BLOCKING_PROFILES = {
+    'legacy': {'resource_types': ['image', 'font', 'media'], 'url_patterns': AD_AND_TRACKER_PATTERNS},
+    'dispatch': {'resource_types': ['image', 'font', 'media'], 'url_patterns': AD_AND_TRACKER_PATTERNS},
+    'auditor': {'resource_types': ['image', 'font', 'media'], 'url_patterns': AD_AND_TRACKER_PATTERNS},
+}
+
+
+def profile_patterns(profile):
+    patterns = []
+    for resource_type in profile.get('resource_types', []):
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+    patterns.extend(profile.get('url_patterns', []))
+    return patterns
+
+
+class RequestBlocker:
+    """Apply a blocking profile to a driver and count blocked vs. loaded requests from its performance log"""
+
+    def __init__(self, profiles=None, enabled=True):
+        self.profiles = profiles or BLOCKING_PROFILES
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.blocked_requests = defaultdict(int)
+        self.blocked_by_type = defaultdict(int)
+        self.loaded_requests = defaultdict(int)
+        self.loaded_bytes = defaultdict(int)
+
+    def apply(self, driver, profile_name):
+        """Switch the driver to a profile; a no-op when it already uses that profile"""
+        if not self.enabled or getattr(driver, 'blocking_profile', None) == profile_name:
+            return
+        patterns = profile_patterns(self.profiles.get(profile_name, {}))
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            driver.blocking_profile = profile_name
+        except Exception as e:
+            print(f"Could not apply request blocking profile {profile_name}: {e}")
+
+    def collect(self, driver, profile_name):
+        """Drain the driver's performance log into the counters for a profile"""
+        if not self.enabled:
+            return
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return
+
+        request_types = {}
+        blocked = defaultdict(int)
+        loaded = 0
+        loaded_bytes = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                request_types[params.get('requestId')] = params.get('type', 'Other')
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                blocked[params.get('type') or request_types.get(params.get('requestId'), 'Other')] += 1
+            elif method == 'Network.loadingFinished':
+                loaded += 1
+                loaded_bytes += int(params.get('encodedDataLength') or 0)
+
+        with self.lock:
+            for resource_type, count in blocked.items():
+                self.blocked_requests[profile_name] += count
+                self.blocked_by_type[(profile_name, resource_type)] += count
+            self.loaded_requests[profile_name] += loaded
+            self.loaded_bytes[profile_name] += loaded_bytes
+
+    def summary_lines(self):
+        lines = []
+        for profile_name in sorted(set(self.blocked_requests) | set(self.loaded_requests)):
+            types = ', '.join(
+                f"{resource_type}={count}"
+                for (name, resource_type), count in sorted(self.blocked_by_type.items())
+                if name == profile_name
+            )
+            lines.append(
+                f"{profile_name}: blocked {self.blocked_requests[profile_name]} requests"
+                f"{f' ({types})' if types else ''}, "
+                f"loaded {self.loaded_requests[profile_name]} requests / "
+                f"{self.loaded_bytes[profile_name] / (1024 * 1024):.1f} MB"
+            )
+        return lines
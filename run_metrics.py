@@ -0,0 +1,232 @@
+"""Per-run instrumentation: stage spans, latency histograms and counters, written as JSON and a Prometheus textfile"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+# Upper bounds in seconds, from a cached HTTP lookup to a Chrome search that hit every wait
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_PREFIX = 'obituary_scraper'
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        index = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside the bucket it falls in"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets + (self.max,), self.counts):
+            if count and seen + count >= rank:
+                return min(lower + (bound - lower) * (rank - seen) / count, self.max)
+            seen += count
+            lower = bound
+        return self.max
+
+    def report(self):
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative.append([bound, total])
+        return {
+            'count': self.count,
+            'sum_seconds': round(self.sum, 3),
+            'mean_seconds': round(self.sum / self.count, 3) if self.count else None,
+            'p50_seconds': _round(self.quantile(0.5)),
+            'p95_seconds': _round(self.quantile(0.95)),
+            'max_seconds': round(self.max, 3),
+            'buckets': cumulative,
+        }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+class RunMetrics:
+    """Collects one run's stage timings, latencies, counters and gauges; thread-safe"""
+
+    def __init__(self, labels=None):
+        self.labels = dict(labels or {})
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.stage_errors = defaultdict(int)
+        self.histograms = {}
+        self.counters = defaultdict(float)
+        self.gauges = {}
+
+    @contextmanager
+    def span(self, stage):
+        """Time a block under `stage`; repeated spans of one stage add up"""
+        start = time.monotonic()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.add_span(stage, time.monotonic() - start, failed)
+
+    def add_span(self, stage, seconds, failed=False):
+        with self.lock:
+            self.stage_seconds[stage] += seconds
+            self.stage_calls[stage] += 1
+            if failed:
+                self.stage_errors[stage] += 1
+
+    def observe(self, name, seconds):
+        with self.lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].observe(seconds)
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    def set_gauge(self, name, value):
+        """Record a number for the run, e.g. a throughput or a component's own counter"""
+        with self.lock:
+            self.gauges[name] = value
+
+    def rate(self, counter, stage):
+        """Counter per second of time spent in stage, or None before the stage has run"""
+        seconds = self.stage_seconds.get(stage)
+        return self.counters.get(counter, 0) / seconds if seconds else None
+
+    def report(self):
+        with self.lock:
+            return {
+                'labels': self.labels,
+                'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'duration_seconds': round(time.time() - self.started, 3),
+                'stages': {stage: {
+                    'seconds': round(self.stage_seconds[stage], 3),
+                    'calls': self.stage_calls[stage],
+                    'errors': self.stage_errors[stage],
+                } for stage in self.stage_seconds},
+                'histograms': {name: histogram.report() for name, histogram in self.histograms.items()},
+                'counters': {name: _number(round(value, 3)) for name, value in sorted(self.counters.items())},
+                'gauges': {name: _round(value) for name, value in sorted(self.gauges.items())},
+            }
+
+    def prometheus_text(self):
+        """The report in the Prometheus text exposition format, for node_exporter's textfile collector"""
+        report = self.report()
+        labels = self.labels
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+        def sample(name, value, **extra):
+            lines.append(f"{METRIC_PREFIX}_{name}{_labels(dict(labels, **extra))} {_number(value)}")
+
+        family('run_duration_seconds', 'gauge', 'Wall time of the last run')
+        sample('run_duration_seconds', report['duration_seconds'])
+        family('run_start_timestamp_seconds', 'gauge', 'Unix time the last run started')
+        sample('run_start_timestamp_seconds', round(self.started, 3))
+        family('stage_seconds', 'gauge', 'Wall time spent in each stage of the last run')
+        for stage, entry in report['stages'].items():
+            sample('stage_seconds', entry['seconds'], stage=stage)
+        family('stage_errors', 'gauge', 'Stage spans that ended in an exception in the last run')
+        for stage, entry in report['stages'].items():
+            sample('stage_errors', entry['errors'], stage=stage)
+        for name, histogram in self.histograms.items():
+            metric = f"{_metric_name(name)}_seconds"
+            family(metric, 'histogram', f"Latency of each {name} call in the last run")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                sample(f"{metric}_bucket", cumulative, le=_number(bound))
+            sample(f"{metric}_bucket", histogram.count, le='+Inf')
+            sample(f"{metric}_sum", round(histogram.sum, 6))
+            sample(f"{metric}_count", histogram.count)
+        family('events_total', 'counter', 'Events counted during the last run')
+        for name, value in report['counters'].items():
+            sample('events_total', value, event=name)
+        for name, value in report['gauges'].items():
+            if value is not None:
+                family(_metric_name(name), 'gauge', f"{name} in the last run")
+                sample(_metric_name(name), round(float(value), 6))
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory=None, textfile_dir=None):
+        """Write run_metrics_<time>.json and <prefix>.prom; return their paths
+
+        The JSON reports accumulate, one per run, for trending. The textfile is replaced
+        atomically each run, as node_exporter's textfile collector requires.
+        """
+        directory = directory or os.getenv('METRICS_DIR')
+        textfile_dir = textfile_dir or os.getenv('METRICS_TEXTFILE_DIR') or directory
+        os.makedirs(directory, exist_ok=True)
+        os.makedirs(textfile_dir, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started).strftime('%Y%m%d_%H%M%S')
+        json_path = os.path.join(directory, f"run_metrics_{stamp}.json")
+        _write_atomic(json_path, json.dumps(self.report(), indent=2) + '\n')
+        suffix = f"_{self.labels['county']}" if self.labels.get('county') else ''
+        prom_path = os.path.join(textfile_dir, f"{METRIC_PREFIX}{suffix}.prom")
+        _write_atomic(prom_path, self.prometheus_text())
+        return json_path, prom_path
+
+    def summary_lines(self):
+        report = self.report()
+        lines = [f"{stage}: {entry['seconds']:.1f}s" + (f" over {entry['calls']} calls" if entry['calls'] > 1 else '')
+                 + (f", {entry['errors']} failed" if entry['errors'] else '')
+                 for stage, entry in report['stages'].items()]
+        for name, histogram in report['histograms'].items():
+            lines.append(f"{name} latency: {histogram['count']} calls, p50 {histogram['p50_seconds']}s, "
+                         f"p95 {histogram['p95_seconds']}s, max {histogram['max_seconds']}s")
+        lines.extend(f"{name}: {value}" for name, value in report['counters'].items())
+        lines.extend(f"{name}: {value}" for name, value in report['gauges'].items())
+        return lines
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _metric_name(name):
+    return ''.join(char if char.isalnum() else '_' for char in name)
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                     for key, value in sorted(labels.items()))
+    return '{' + pairs + '}'
+
+
+def _write_atomic(path, text):
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temporary, path)
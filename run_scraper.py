@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import sys
 import os
+import argparse
 import logging
 from datetime import datetime
 import traceback
 from IntegratedObituaryPropertyScraper import IntegratedObituaryPropertyScraper
+from county_runner import run_counties
 
 # Set up logging
 log_dir = os.path.expanduser('~/obituary_scraper_logs')
@@ -19,14 +21,65 @@ logging.basicConfig(
     ]
 )
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape obituaries and enrich them with auditor property records")
+    parser.add_argument('--engine', choices=['selenium', 'http'], default=None,
+                        help="Auditor lookup engine (defaults to $AUDITOR_ENGINE or selenium)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Concurrent lookup sessions (defaults to $LOOKUP_WORKERS or 1)")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Global lookup rate limit per second (defaults to $LOOKUP_RATE or 0.5)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Skip the persistent auditor result cache")
+    parser.add_argument('--no-parcel-index', action='store_true',
+                        help="Skip the offline owner index built from the county's bulk parcel extract")
+    parser.add_argument('--full-rescan', action='store_true', default=None,
+                        help="Scroll every listing to the end instead of stopping at previously collected entries")
+    parser.add_argument('--fetch-mode', choices=['browser', 'http', 'auto'], default=None,
+                        help="How listings are fetched (defaults to $FETCH_MODE or browser)")
+    parser.add_argument('--resume', action='store_true', default=None,
+                        help="Continue a failed run from its checkpoint instead of scraping again "
+                             "(without it, the checkpoint's rows are merged into a fresh scrape)")
+    parser.add_argument('--output-format', choices=['csv', 'parquet', 'both'], default=None,
+                        help="Files uploaded at the end of the run (defaults to $OUTPUT_FORMAT or csv)")
+    parser.add_argument('--county', default=None,
+                        help="County from counties.json to scrape (defaults to $COUNTY or franklin)")
+    parser.add_argument('--counties', default=None,
+                        help="Comma-separated counties, or 'all', each run in its own worker process")
+    parser.add_argument('--max-parallel', type=int, default=None,
+                        help="Counties running at once with --counties (defaults to $MAX_PARALLEL_COUNTIES or the CPU count)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     try:
         logging.info("Starting obituary scraper")
         logging.info(f"Script started at {datetime.now()}")
         
-        # Initialize and run the scraper
-        scraper = IntegratedObituaryPropertyScraper()
-        scraper.run()
+        options = dict(
+            lookup_engine=args.engine,
+            lookup_workers=args.workers,
+            lookup_rate=args.rate,
+            use_cache=not args.no_cache,
+            use_parcel_index=not args.no_parcel_index,
+            full_rescan=args.full_rescan,
+            fetch_mode=args.fetch_mode,
+            resume=args.resume,
+            output_format=args.output_format
+        )
+        if args.counties:
+            keys = None if args.counties == 'all' else [key.strip() for key in args.counties.split(',') if key.strip()]
+            summaries = run_counties(keys, max_parallel=args.max_parallel, **options)
+            failed = [summary['county'] for summary in summaries if summary['status'] != 'ok']
+            if failed:
+                logging.error(f"Counties failed: {', '.join(failed)}")
+                sys.exit(1)
+        else:
+            # Initialize and run the scraper
+            scraper = IntegratedObituaryPropertyScraper(county=args.county, **options)
+            scraper.run()
+            if scraper.metrics_paths:
+                logging.info(f"Run metrics: {', '.join(scraper.metrics_paths)}")
         
         logging.info("Scraping completed successfully")
         
@@ -0,0 +1,88 @@
+"""Per-source high-water marks so daily scrapes stop at yesterday's entries"""
+import hashlib
+import json
+import os
+
+from dateutil import parser as date_parser
+
+from config import get_state_dir
+
+
+def parse_header_date(text):
+    """Parse a listing date header such as 'October 15, 2024', or None if it is not a date"""
+    try:
+        return date_parser.parse(text, fuzzy=True).date()
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+def entry_fingerprint(entry):
+    key = '|'.join(str(getattr(entry, field) or '').strip().lower() for field in ('source', 'date', 'name'))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class SourceHighWaterMark:
+    """Newest date header plus fingerprints of entries already collected from one source"""
+
+    def __init__(self, source, path=None, full_rescan=False, max_fingerprints=5000, state_dir=None):
+        self.source = source
+        self.path = path or os.path.join(state_dir or get_state_dir(), f"high_water_{source.replace('.', '_')}.json")
+        self.full_rescan = full_rescan
+        self.max_fingerprints = max_fingerprints
+        # Newest date header as of the last saved run; only save() moves it
+        self.newest_date = None
+        # Newest date header seen so far in this run
+        self.run_newest_date = None
+        self.known = set()
+        self.ordered = []
+        self.seen_this_run = []
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    state = json.load(f)
+                self.newest_date = state.get('newest_date')
+                self.ordered = state.get('fingerprints', [])
+                self.known = set(self.ordered)
+            except Exception as e:
+                print(f"Ignoring unreadable high-water mark {self.path}: {e}")
+
+    def is_known(self, entry):
+        if entry_fingerprint(entry) in self.known:
+            return True
+        # Anything filed under a date older than last run's newest header was already passed.
+        # This run's headers must not count: a listing shows today's cards above yesterday's
+        # unseen ones, and those are only known by fingerprint.
+        if self.newest_date:
+            entry_date = parse_header_date(entry.date)
+            mark_date = parse_header_date(self.newest_date)
+            if entry_date and mark_date and entry_date < mark_date:
+                return True
+        return False
+
+    def all_known(self, entries):
+        """True when a scroll step produced entries and every one was collected on an earlier run"""
+        if self.full_rescan or not entries:
+            return False
+        return all(self.is_known(entry) for entry in entries)
+
+    def record(self, entries):
+        for entry in entries:
+            self.seen_this_run.append(entry_fingerprint(entry))
+            entry_date = parse_header_date(entry.date)
+            newest = self.run_newest_date or self.newest_date
+            mark_date = parse_header_date(newest) if newest else None
+            if entry_date and (mark_date is None or entry_date > mark_date):
+                self.run_newest_date = entry.date
+
+    def save(self):
+        """Persist this run's fingerprints ahead of older ones, bounded to max_fingerprints"""
+        merged = list(dict.fromkeys(self.seen_this_run + self.ordered))[:self.max_fingerprints]
+        newest_date = self.run_newest_date or self.newest_date
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'source': self.source, 'newest_date': newest_date, 'fingerprints': merged}, f)
+        os.replace(tmp_path, self.path)
+        self.newest_date = newest_date
+        self.ordered = merged
+        self.known = set(merged)
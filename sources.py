@@ -0,0 +1,127 @@
+"""Obituary listing sources and a scheduler that scrapes all of them concurrently"""
+from concurrent.futures import ThreadPoolExecutor
+
+from listing_parsers import parse_dispatch_cards, parse_legacy_cards
+from page_state import fetch_listing, parse_listing_state
+
+SOURCE_ADAPTERS = {}
+
+
+def register_source(cls):
+    """Class decorator adding an adapter to the registry under its key"""
+    SOURCE_ADAPTERS[cls.key] = cls
+    return cls
+
+
+class SourceAdapter:
+    """One listing site: where it lives, how it is fetched and how records are extracted"""
+
+    key = None
+    source_name = None
+    default_url = None
+    default_age = 'N/A'
+    default_location = 'N/A'
+    # Where the listing sits in the embedded state: a blob label, then the keys down to it.
+    # A path that does not resolve only costs the fallback to the rendered cards.
+    state_paths = ()
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    @property
+    def url(self):
+        return self.scraper.sources.get(self.key, self.default_url)
+
+    def fetch(self):
+        """Fetch the listing HTML without a browser"""
+        return fetch_listing(self.url)
+
+    def extract(self, html):
+        """Turn listing HTML into (date header, full name, age, location) tuples"""
+        cards = parse_listing_state(html, self.state_paths)
+        if cards:
+            return cards
+        print(f"No {self.key} listing at the known page state path, parsing the rendered cards")
+        return self.parse_cards(html)
+
+    def parse_cards(self, html):
+        """(date header, full name, age, location) tuples from the server-rendered cards"""
+        return []
+
+    def scrape_browser(self, driver):
+        raise NotImplementedError
+
+    def run(self):
+        """Scrape this source into the scraper's store using the configured fetch mode"""
+        with self.scraper.metrics.span(f"scrape.{self.key}"):
+            self._run()
+
+    def _run(self):
+        mode = self.scraper.fetch_mode
+        if mode in ('http', 'auto'):
+            if self.scraper.scrape_listing_http(self) or mode == 'http':
+                return
+            print(f"No embedded state decoded for {self.key}, falling back to the browser")
+
+        driver, owned = self.scraper.borrow_driver()
+        try:
+            self.scrape_browser(driver)
+        finally:
+            if owned:
+                try:
+                    driver.quit()
+                except:
+                    pass
+
+
+@register_source
+class LegacyAdapter(SourceAdapter):
+    key = 'legacy'
+    source_name = 'legacy.com'
+    default_url = "https://www.legacy.com/us/obituaries/local/ohio/franklin-county"
+    default_location = 'Ohio'
+    # Unverified: not yet checked against a saved live page
+    state_paths = (('__NEXT_DATA__', 'props', 'pageProps', 'obituaryList', 'obituaries'),)
+
+    def parse_cards(self, html):
+        return [(date, name, None, None) for date, name in parse_legacy_cards(html)]
+
+    def scrape_browser(self, driver):
+        self.scraper.scrape_legacy(driver)
+
+
+@register_source
+class DispatchAdapter(SourceAdapter):
+    key = 'dispatch'
+    source_name = 'dispatch.com'
+    default_url = "https://www.dispatch.com/obituaries/"
+    # Unverified: not yet checked against a saved live page
+    state_paths = (('__NEXT_DATA__', 'props', 'pageProps', 'obituaries'),)
+
+    def parse_cards(self, html):
+        return parse_dispatch_cards(html)
+
+    def scrape_browser(self, driver):
+        self.scraper.scrape_dispatch(driver)
+
+
+def scrape_all_sources(scraper, keys=None):
+    """Run every configured adapter at once; records merge into the scraper's shared store"""
+    keys = keys or [key for key in scraper.sources if key in SOURCE_ADAPTERS]
+    adapters = [SOURCE_ADAPTERS[key](scraper) for key in keys]
+    if len(adapters) <= 1:
+        for adapter in adapters:
+            adapter.run()
+        return
+
+    with ThreadPoolExecutor(max_workers=len(adapters)) as executor:
+        futures = [executor.submit(adapter.run) for adapter in adapters]
+        errors = []
+        for adapter, future in zip(adapters, futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error scraping {adapter.key}: {e}")
+                errors.append(e)
+    if errors:
+        raise errors[0]